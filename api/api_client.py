@@ -4,20 +4,343 @@ Using the official MSU API from https://msu.io/builder/docs
 """
 
 import requests
-import json
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+import random
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Iterable, Iterator, Optional
+from datetime import datetime, timezone
 from models.character import Character
-from models.item import Item
+from models.search_index import normalize_key
+from api.parsing import (
+    parse_character_details, parse_character_summary,
+    parse_ranking_entry, parse_search_entry
+)
+from api.cache import CachingSession, ResponseCache
+from api.name_index import NameIndex
+from api.metrics import ApiMetrics, endpoint_label
+from api.singleflight import SingleFlight, character_key
+from api.streaming import iter_response_array
+
+
+# Priority lanes for the request scheduler; lower values go first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+
+class RateLimitError(Exception):
+    """Raised when the API is still rate limiting a request after all retries"""
+    
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class BulkLookupResult:
+    """Outcome of one name in MSUApiClient.get_characters_bulk"""
+    name: str
+    character: Optional[Character] = None
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.character is not None
+
+
+class TokenBucket:
+    """Client-side token bucket (not thread-safe; RequestScheduler locks it)"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+    
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = max(self.updated, now)
+    
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
+    def take(self):
+        self.tokens -= 1
+    
+    def pause(self, seconds: float):
+        """Hand out no tokens for the given time, then restart from empty"""
+        until = time.monotonic() + seconds
+        if until > self.paused_until:
+            self.paused_until = until
+            self.tokens = 0.0
+            self.updated = until
+
+
+class RequestScheduler:
+    """
+    Paces outgoing requests and retries throttled or failed ones
+    
+    Requests take a token from a shared bucket before going on the wire.
+    Interactive requests are served before background ones whenever both are
+    waiting. Responses with 429 or 5xx are retried with jittered exponential
+    backoff, and Retry-After / X-RateLimit-* headers pause the whole bucket
+    so no other request trips the server-side limiter in the meantime.
+    
+    Args:
+        rate: Requests per second allowed on average
+        burst: Requests allowed back to back before pacing kicks in
+        max_retries: Retries for a request answered with 429/5xx
+        backoff_base: First backoff step in seconds
+        backoff_max: Upper bound of a single backoff step in seconds
+    """
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, rate: float = 10.0, burst: int = 10, max_retries: int = 4,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._cond = threading.Condition()
+        self._waiting = {PRIORITY_INTERACTIVE: 0, PRIORITY_BACKGROUND: 0}
+        self._local = threading.local()
+    
+    @contextmanager
+    def lane(self, priority: int):
+        """Run requests made by this thread in the given priority lane"""
+        previous = getattr(self._local, 'priority', PRIORITY_INTERACTIVE)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+    
+    def current_priority(self) -> int:
+        return getattr(self._local, 'priority', PRIORITY_INTERACTIVE)
+    
+    def acquire(self, priority: int):
+        """Block until a request in this lane may be sent"""
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    if any(count for lane, count in self._waiting.items() if lane < priority):
+                        # Let higher-priority lanes take the next tokens
+                        self._cond.wait()
+                        continue
+                    wait = self.bucket.wait_time(time.monotonic())
+                    if wait <= 0:
+                        self.bucket.take()
+                        return
+                    self._cond.wait(wait)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+    
+    def try_acquire(self, priority: int) -> float:
+        """
+        Take a token without blocking, for callers that cannot wait on a lock
+        
+        Returns 0 when a token was taken, otherwise the seconds to sleep
+        before trying again. Threads waiting in a higher-priority lane are
+        served first, as with acquire.
+        """
+        with self._cond:
+            now = time.monotonic()
+            wait = self.bucket.wait_time(now)
+            if any(count for lane, count in self._waiting.items() if lane < priority):
+                # Try again once the waiting lane has had a chance at the next token
+                return max(wait, 1.0 / self.bucket.rate)
+            if wait <= 0:
+                self.bucket.take()
+            return wait
+    
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+    
+    def observe(self, response: requests.Response):
+        """Pause the bucket when the server says the rate budget is spent"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = _parse_seconds(response.headers.get('X-RateLimit-Reset'))
+        if remaining is not None and reset is not None:
+            try:
+                if int(float(remaining)) <= 0:
+                    self.pause(reset)
+            except ValueError:
+                pass
+    
+    def pause(self, seconds: float):
+        with self._cond:
+            self.bucket.pause(seconds)
+            self._cond.notify_all()
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After / reset header given as seconds, epoch or HTTP date"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+        # Large values are absolute epoch timestamps rather than deltas
+        if seconds > 1e9:
+            seconds -= time.time()
+        return max(0.0, seconds)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _timeout_budget(timeout) -> Optional[float]:
+    """Seconds a request may take in total, from a requests timeout argument"""
+    if isinstance(timeout, tuple):
+        timeout = timeout[-1]
+    return float(timeout) if isinstance(timeout, (int, float)) else None
+
+
+class ScheduledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that sends every request through a RequestScheduler
+    
+    Waits asked for with Retry-After are capped at the scheduler's
+    backoff_max. When the server asks for longer than is left of the
+    request's timeout, a throttled request raises RateLimitError (and other
+    retryable responses are returned) at once instead of sleeping. With
+    metrics, retried attempts and the body bytes read from the network are
+    recorded per endpoint.
+    """
+    
+    def __init__(self, scheduler: RequestScheduler, metrics: ApiMetrics = None, **kwargs):
+        self.scheduler = scheduler
+        self.metrics = metrics
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        scheduler = self.scheduler
+        metrics = self.metrics
+        endpoint = endpoint_label(request.url) if metrics is not None else None
+        priority = scheduler.current_priority()
+        budget = _timeout_budget(kwargs.get('timeout'))
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            scheduler.acquire(priority)
+            try:
+                response = super().send(request, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if attempt >= scheduler.max_retries:
+                    raise
+                if metrics is not None:
+                    metrics.record_retry(endpoint, "connection")
+                time.sleep(scheduler.backoff(attempt))
+                attempt += 1
+                continue
+            
+            scheduler.observe(response)
+            if response.status_code not in scheduler.RETRY_STATUSES or attempt >= scheduler.max_retries:
+                if metrics is not None:
+                    response.raw = metrics.counting_reader(response.raw, endpoint)
+                return response
+            
+            retry_after = _parse_seconds(response.headers.get('Retry-After'))
+            if retry_after is None:
+                delay = scheduler.backoff(attempt)
+            else:
+                delay = min(retry_after, scheduler.backoff_max)
+                if budget is not None and retry_after > budget - (time.monotonic() - started):
+                    # Waiting would overrun the caller's deadline; leave the retry to them
+                    if response.status_code == 429:
+                        response.close()
+                        scheduler.pause(delay)
+                        raise RateLimitError(f"MSU API rate limit exceeded for {request.url}",
+                                             retry_after)
+                    if metrics is not None:
+                        response.raw = metrics.counting_reader(response.raw, endpoint)
+                    return response
+            
+            if metrics is not None:
+                metrics.record_retry(endpoint, str(response.status_code))
+            response.close()
+            if response.status_code == 429:
+                # Throttling applies to every request, not just this one
+                scheduler.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
 
 
 class MSUApiClient:
     """Client for interacting with MapleStory Universe (MSU) API"""
     
-    def __init__(self, api_key: str = None, base_url: str = None):
+    # Largest page the rankings endpoint returns in a single request
+    MAX_PAGE_SIZE = 100
+    # Results requested from the search endpoint
+    SEARCH_LIMIT = 50
+    
+    def __init__(self, api_key: str = None, base_url: str = None,
+                 detail_limit: int = 10, max_workers: int = 8,
+                 request_timeout: float = 10.0, cache: ResponseCache = None,
+                 scheduler: RequestScheduler = None, metrics: ApiMetrics = None,
+                 name_index: NameIndex = None):
+        """
+        Args:
+            api_key: MSU API key sent as a bearer token
+            base_url: Base URL of the MSU API
+            detail_limit: Characters ranked at or above this get their
+                equipment fetched by get_top_characters
+            max_workers: Maximum number of detail lookups run concurrently
+            request_timeout: Deadline in seconds for a single API call
+            cache: Response cache used by the session; defaults to an
+                in-memory cache (set session.cache to None to disable)
+            scheduler: Rate limiter and retry policy for outgoing requests
+            metrics: Collector for request counts, latency, bytes, retries
+                and cache outcomes; a new one is created by default
+            name_index: Index fed with the names from top rankings, lookups
+                and searches, used by autocomplete; off by default so
+                bulk walks do not accumulate names
+        """
         self.api_key = api_key
         self.base_url = base_url or "https://api.msu.io"
-        self.session = requests.Session()
+        self.detail_limit = detail_limit
+        self.max_workers = max(1, max_workers)
+        self.request_timeout = request_timeout
+        self.session = CachingSession(cache if cache is not None else ResponseCache())
+        self.scheduler = scheduler or RequestScheduler()
+        self.metrics = metrics if metrics is not None else ApiMetrics()
+        self.name_index = name_index
+        # Concurrent lookups of the same character share one request
+        self._inflight = SingleFlight()
+        # True when the last get_top_characters fell back to mock data
+        self.using_mock_data = False
+        
+        # Size the connection pool so concurrent lookups reuse connections
+        # instead of opening (and discarding) one per worker. Only requests
+        # that miss the cache reach the adapter and use up rate budget.
+        adapter = ScheduledAdapter(
+            self.scheduler,
+            self.metrics,
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
         # Set up headers for MSU API
         headers = {
@@ -30,6 +353,36 @@ class MSUApiClient:
         
         self.session.headers.update(headers)
     
+    def _get(self, endpoint: str, params: Dict = None,
+             priority: int = PRIORITY_INTERACTIVE, **kwargs) -> requests.Response:
+        """
+        GET an API endpoint through the cache and the request scheduler
+        
+        Raises:
+            RateLimitError: The API still answered 429 after all retries
+        """
+        label = endpoint_label(endpoint)
+        start = time.perf_counter()
+        try:
+            with self.scheduler.lane(priority):
+                response = self.session.get(endpoint, params=params,
+                                            timeout=self.request_timeout, **kwargs)
+        except Exception as e:
+            self.metrics.record_request(label, type(e).__name__, time.perf_counter() - start)
+            raise
+        
+        outcome = getattr(response, 'cache_outcome', None)
+        if outcome is not None:
+            self.metrics.record_cache(label, outcome)
+        # Cache hits never reached the network, so they stay out of the latency histogram
+        elapsed = None if outcome == 'hit' else time.perf_counter() - start
+        self.metrics.record_request(label, str(response.status_code), elapsed)
+        
+        if response.status_code == 429:
+            retry_after = _parse_seconds(response.headers.get('Retry-After'))
+            raise RateLimitError(f"MSU API rate limit exceeded for {endpoint}", retry_after)
+        return response
+    
     def get_top_characters(self, limit: int = 100, world: str = None) -> List[Character]:
         """
         Get top characters by ranking from MSU API
@@ -39,165 +392,380 @@ class MSUApiClient:
             world: Specific world to get rankings from (optional)
         """
         try:
-            # MSU API endpoint for character rankings
-            endpoint = f"{self.base_url}/v1/characters/rankings"
-            params = {
-                'limit': min(limit, 100),
-                'type': 'overall'  # overall, level, fame, etc.
-            }
-            
-            if world:
-                params['world'] = world
-            
-            response = self.session.get(endpoint, params=params)
+            response = self._request_rankings_page(min(limit, self.MAX_PAGE_SIZE), world,
+                                                   stream=True)
             
             if response.status_code == 200:
-                data = response.json()
-                characters = []
+                characters = [parse_ranking_entry(rank_data, world)
+                              for rank_data in iter_response_array(response, 'rankings')]
+                
+                characters = characters[:limit]
+                self._index_names(characters)
                 
-                for rank_data in data.get('rankings', []):
-                    char = Character(
-                        rank=rank_data.get('rank', 0),
-                        name=rank_data.get('name', 'Unknown'),
-                        level=rank_data.get('level', 0),
-                        job=rank_data.get('job', 'Unknown'),
-                        guild=rank_data.get('guild'),
-                        popularity=rank_data.get('fame', 0),
-                        avatar_url=rank_data.get('avatar_url')
-                    )
-                    
-                    # Get detailed character info for top 10
-                    if char.rank <= 10:
-                        char_details = self._get_character_details(char.name, world)
-                        if char_details:
-                            char.avatar_url = char_details.get('avatar_url', char.avatar_url)
-                            char.equipment = char_details.get('equipment', {})
-                    
-                    characters.append(char)
+                # Get detailed character info for the top ranks
+                detailed = [char for char in characters if char.rank <= self.detail_limit]
+                self._fill_character_details(detailed, world)
                 
-                return characters[:limit]
+                self.using_mock_data = False
+                return characters
             else:
                 print(f"MSU API Error: {response.status_code}")
                 print(f"Response: {response.text}")
+                self.using_mock_data = True
+                self.metrics.record_mock_fallback('get_top_characters')
                 return self._get_mock_characters(limit)
                 
+        except RateLimitError:
+            # Throttling is temporary; report it instead of showing fake data
+            raise
         except Exception as e:
             print(f"Error getting top characters from MSU API: {str(e)}")
+            self.using_mock_data = True
+            self.metrics.record_mock_fallback('get_top_characters')
             return self._get_mock_characters(limit)
     
-    def _get_character_details(self, character_name: str, world: str = None) -> Optional[Dict]:
-        """Get detailed character information from MSU API"""
+    def iter_top_characters(self, limit: int = 100, world: str = None,
+                            priority: int = PRIORITY_INTERACTIVE) -> Iterator[Character]:
+        """
+        Stream the top ranking page, yielding characters as they are downloaded
+        
+        Rows are parsed straight off the response body, so the first character
+        is available before the page has finished downloading and memory use
+        does not grow with the page size. Details are not fetched and API
+        errors are raised instead of being replaced with mock data.
+        
+        Args:
+            limit: Number of characters to return (capped at MAX_PAGE_SIZE)
+            world: Specific world to get rankings from (optional)
+            priority: Scheduler lane for the request
+        """
+        response = self._request_rankings_page(min(limit, self.MAX_PAGE_SIZE), world,
+                                               priority=priority, stream=True)
+        if response.status_code != 200:
+            response.close()
+            response.raise_for_status()
+            return
+        seen = []
         try:
-            endpoint = f"{self.base_url}/v1/characters/{character_name}"
-            params = {}
-            if world:
-                params['world'] = world
-            
-            response = self.session.get(endpoint, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
+            for rank_data in iter_response_array(response, 'rankings'):
+                char = parse_ranking_entry(rank_data, world)
+                seen.append(char)
+                yield char
+        finally:
+            self._index_names(seen)
+    
+    def iter_rankings(self, world: str = None, page_size: int = 100,
+                      max_rows: int = None, ranking_type: str = 'overall',
+                      priority: int = PRIORITY_BACKGROUND,
+                      start_row: int = 0) -> Iterator[Character]:
+        """
+        Lazily iterate over the full rankings, one page at a time
+        
+        The next page is requested in the background while the caller is still
+        consuming the current one, so at most two pages are held in memory no
+        matter how deep the iteration goes. Unlike get_top_characters, API errors
+        are raised instead of being replaced with mock data.
+        
+        Args:
+            world: Specific world to get rankings from (optional)
+            page_size: Rows requested per page (capped at MAX_PAGE_SIZE)
+            max_rows: Stop after this many rows (optional)
+            ranking_type: Ranking to walk (overall, level, fame, etc.)
+            priority: Scheduler lane for the page requests
+            start_row: Rows to skip from the top, e.g. to resume an export
+        """
+        page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        start_row = max(0, start_row)
+        
+        def fetch_page(page: int) -> List[Character]:
+            response = self._request_rankings_page(page_size, world, page=page,
+                                                   ranking_type=ranking_type,
+                                                   priority=priority, stream=True)
+            if response.status_code != 200:
+                response.close()
+                response.raise_for_status()
+                return []
+            return [parse_ranking_entry(rank_data, world)
+                    for rank_data in iter_response_array(response, 'rankings')]
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="msu-rankings")
+        try:
+            page = start_row // page_size + 1
+            skip = start_row % page_size
+            remaining = max_rows
+            pending = executor.submit(fetch_page, page)
+            while pending is not None:
+                characters = pending.result()
+                full_page = len(characters) == page_size
+                if skip:
+                    characters = characters[skip:]
+                    skip = 0
+                if remaining is not None:
+                    characters = characters[:remaining]
+                    remaining -= len(characters)
                 
-                # Parse equipment data
-                equipment = {}
-                for item_data in data.get('equipment', []):
-                    slot = item_data.get('slot', 'unknown')
-                    equipment[slot] = Item(
-                        name=item_data.get('name', 'Unknown'),
-                        slot=slot,
-                        level=item_data.get('level', 0),
-                        image_url=item_data.get('image_url')
-                    )
+                # Prefetch the next page before handing this one to the caller
+                pending = None
+                if full_page and (remaining is None or remaining > 0):
+                    page += 1
+                    pending = executor.submit(fetch_page, page)
                 
-                return {
-                    'avatar_url': data.get('avatar_url'),
-                    'equipment': equipment
-                }
+                yield from characters
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _request_rankings_page(self, page_size: int, world: str = None, page: int = None,
+                               ranking_type: str = 'overall',
+                               priority: int = PRIORITY_INTERACTIVE, **kwargs) -> requests.Response:
+        """Request a single page of the character rankings"""
+        # MSU API endpoint for character rankings
+        endpoint = f"{self.base_url}/v1/characters/rankings"
+        params = {
+            'limit': page_size,
+            'type': ranking_type  # overall, level, fame, etc.
+        }
+        
+        if page is not None:
+            params['page'] = page
+        if world:
+            params['world'] = world
+        
+        return self._get(endpoint, params=params, priority=priority, **kwargs)
+    
+    def _fill_character_details(self, characters: List[Character], world: str = None,
+                                priority: int = PRIORITY_INTERACTIVE):
+        """
+        Fetch details for the given characters concurrently and merge them in place
+        
+        At most max_workers lookups are in flight at once. Each lookup is bounded
+        by request_timeout; characters whose details are not back in time keep
+        their ranking data. The order of the list is left untouched.
+        """
+        if not characters:
+            return
+        
+        workers = min(self.max_workers, len(characters))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="msu-details")
+        try:
+            futures = {
+                executor.submit(self._get_character_details, char.name, world, priority): char
+                for char in characters
+            }
+            # Lookups run in waves of max_workers, so allow one deadline per wave
+            waves = -(-len(characters) // workers)
+            deadline = self.request_timeout * waves
+            try:
+                for future in as_completed(futures, timeout=deadline):
+                    char = futures[future]
+                    char_details = future.result()
+                    if char_details:
+                        char.avatar_url = char_details.get('avatar_url', char.avatar_url)
+                        char.equipment = char_details.get('equipment', {})
+            except FuturesTimeoutError:
+                pending = [char.name for future, char in futures.items() if not future.done()]
+                print(f"Timed out getting details for {len(pending)} characters: {', '.join(pending)}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _get_character_details(self, character_name: str, world: str = None,
+                               priority: int = PRIORITY_INTERACTIVE) -> Optional[Dict]:
+        """Get detailed character information from MSU API"""
+        try:
+            data = self._get_character_json(character_name, world, priority)
+            if data is not None:
+                return parse_character_summary(data)
                 
         except Exception as e:
             print(f"Error getting character details for {character_name}: {str(e)}")
         
         return None
     
-    def get_character_details(self, character_name: str) -> Optional[Character]:
+    def get_character_details(self, character_name: str, world: str = None,
+                              priority: int = PRIORITY_INTERACTIVE) -> Optional[Character]:
         """Get detailed information about a specific character"""
         try:
-            endpoint = f"{self.base_url}/v1/characters/{character_name}"
-            response = self.session.get(endpoint)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                char = Character(
-                    rank=0,  # Rank not available in single character lookup
-                    name=data.get('name', character_name),
-                    level=data.get('level', 0),
-                    job=data.get('job', 'Unknown'),
-                    guild=data.get('guild'),
-                    popularity=data.get('fame', 0),
-                    avatar_url=data.get('avatar_url')
-                )
-                
-                # Parse equipment
-                equipment = {}
-                for item_data in data.get('equipment', []):
-                    slot = item_data.get('slot', 'unknown')
-                    equipment[slot] = Item(
-                        name=item_data.get('name', 'Unknown'),
-                        slot=slot,
-                        level=item_data.get('level', 0),
-                        image_url=item_data.get('image_url')
-                    )
-                
-                char.equipment = equipment
-                return char
-                
+            return self._fetch_character(character_name, world, priority)
         except Exception as e:
             print(f"Error getting character details: {str(e)}")
         
         return None
     
+    def _fetch_character(self, character_name: str, world: str = None,
+                         priority: int = PRIORITY_INTERACTIVE) -> Optional[Character]:
+        """
+        Look up a single character, raising on request errors
+        
+        Returns None when the API does not know the character.
+        """
+        data = self._get_character_json(character_name, world, priority)
+        if data is None:
+            return None
+        char = parse_character_details(data, character_name)
+        self._index_names([char])
+        return char
+    
+    def _get_character_json(self, character_name: str, world: str = None,
+                            priority: int = PRIORITY_INTERACTIVE) -> Optional[Dict]:
+        """
+        Decoded character payload, or None when the API does not know the character
+        
+        Concurrent calls for the same character and world (e.g. the top-rank
+        prefetch, a selection and a search hit) share one request and its
+        decoded JSON, whatever the case of the name; each caller builds its
+        own models from it. The shared request runs with the first caller's
+        priority.
+        """
+        endpoint = f"{self.base_url}/v1/characters/{character_name}"
+        params = {}
+        if world:
+            params['world'] = world
+        
+        def fetch() -> Optional[Dict]:
+            response = self._get(endpoint, params=params, priority=priority)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            raise requests.HTTPError(f"Unexpected status {response.status_code}", response=response)
+        
+        return self._inflight.do(
+            character_key(character_name, world), fetch,
+            on_shared=lambda: self.metrics.record_coalesced(endpoint_label(endpoint)))
+    
+    def get_characters_bulk(self, names: Iterable[str], world: str = None,
+                            max_workers: int = None,
+                            priority: int = PRIORITY_BACKGROUND) -> Iterator[BulkLookupResult]:
+        """
+        Look up many characters concurrently, yielding results as they finish
+        
+        Names are deduplicated case-insensitively (the first spelling wins) and
+        at most max_workers lookups run at once. Every name produces exactly one
+        BulkLookupResult; a failed or unknown name is reported in its result
+        instead of aborting the rest of the batch.
+        
+        Args:
+            names: Character names to look up
+            world: Specific world to look the characters up in (optional)
+            max_workers: Concurrent lookups (defaults to the client's max_workers)
+            priority: Scheduler lane for the lookups
+        """
+        unique_names = {}
+        for name in names:
+            name = name.strip()
+            if name:
+                unique_names.setdefault(name.casefold(), name)
+        if not unique_names:
+            return
+        
+        workers = min(max_workers or self.max_workers, len(unique_names))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="msu-bulk")
+        try:
+            futures = {
+                executor.submit(self._fetch_character, name, world, priority): name
+                for name in unique_names.values()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    character = future.result()
+                except Exception as e:
+                    yield BulkLookupResult(name, None, str(e))
+                    continue
+                if character is None:
+                    yield BulkLookupResult(name, None, "Character not found")
+                else:
+                    yield BulkLookupResult(name, character)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def search_characters(self, query: str, world: str = None) -> List[Character]:
         """Search for characters by name using MSU API"""
         try:
-            endpoint = f"{self.base_url}/v1/characters/search"
-            params = {
-                'q': query,
-                'limit': 50
-            }
-            if world:
-                params['world'] = world
-            
-            response = self.session.get(endpoint, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                characters = []
-                
-                for char_data in data.get('characters', []):
-                    char = Character(
-                        rank=0,  # Search results don't include rank
-                        name=char_data.get('name', 'Unknown'),
-                        level=char_data.get('level', 0),
-                        job=char_data.get('job', 'Unknown'),
-                        guild=char_data.get('guild'),
-                        popularity=char_data.get('fame', 0),
-                        avatar_url=char_data.get('avatar_url')
-                    )
-                    characters.append(char)
-                
-                return characters
-                
+            return list(self.iter_search_characters(query, world))
         except Exception as e:
             print(f"Error searching characters: {str(e)}")
         
         return []
     
+    def iter_search_characters(self, query: str, world: str = None,
+                               priority: int = PRIORITY_INTERACTIVE,
+                               limit: int = None) -> Iterator[Character]:
+        """
+        Stream search results, yielding characters as they are downloaded
+        
+        API errors are raised; search_characters wraps this and returns an
+        empty list instead. limit defaults to SEARCH_LIMIT.
+        """
+        limit = limit or self.SEARCH_LIMIT
+        endpoint = f"{self.base_url}/v1/characters/search"
+        params = {
+            'q': query,
+            'limit': limit
+        }
+        if world:
+            params['world'] = world
+        
+        response = self._get(endpoint, params=params, priority=priority, stream=True)
+        if response.status_code != 200:
+            response.close()
+            response.raise_for_status()
+            return
+        
+        seen = []
+        complete = False
+        try:
+            for char_data in iter_response_array(response, 'characters'):
+                char = parse_search_entry(char_data, world)
+                seen.append(char)
+                yield char
+            complete = True
+        finally:
+            self._index_names(seen)
+            # A short page means the API had no more matches for the query
+            if complete and len(seen) < limit and self.name_index is not None:
+                self.name_index.mark_exhausted(query, world)
+    
+    def autocomplete(self, prefix: str, world: str = None, limit: int = 10) -> List[str]:
+        """
+        Character names starting with prefix, for completing a search box
+        
+        Answered from the name index when it already holds limit matches or
+        a previous search returned every match for the prefix; otherwise the
+        search endpoint is asked and its results are added to the index.
+        Without a name index every call goes to the search endpoint.
+        Errors are printed and the local matches returned.
+        """
+        index = self.name_index
+        if not prefix.strip():
+            return []
+        names = index.complete(prefix, world, limit) if index is not None else []
+        if index is not None and (len(names) >= limit or index.is_exhausted(prefix, world)):
+            return names
+        try:
+            found = list(self.iter_search_characters(prefix.strip(), world))
+        except Exception as e:
+            print(f"Error searching characters: {str(e)}")
+            return names
+        if index is not None:
+            return index.complete(prefix, world, limit)
+        
+        key = normalize_key(prefix.strip())
+        names = []
+        for char in found:
+            if normalize_key(char.name).startswith(key) and char.name not in names:
+                names.append(char.name)
+        return sorted(names, key=normalize_key)[:limit]
+    
+    def _index_names(self, characters: List[Character]):
+        if self.name_index is not None:
+            self.name_index.add(characters)
+    
     def get_worlds(self) -> List[str]:
         """Get available worlds from MSU API"""
         try:
             endpoint = f"{self.base_url}/v1/worlds"
-            response = self.session.get(endpoint)
+            response = self._get(endpoint)
             
             if response.status_code == 200:
                 data = response.json()
@@ -208,7 +776,14 @@ class MSUApiClient:
         
         return []
     
-    def _get_mock_characters(self, limit: int) -> List[Character]:
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss/revalidate counters of the response cache"""
+        if self.session.cache is None:
+            return {}
+        return self.session.cache.stats()
+    
+    @staticmethod
+    def _get_mock_characters(limit: int) -> List[Character]:
         """Fallback mock data if MSU API is not available"""
         print("Warning: Using mock data. Please check your MSU API configuration.")
         
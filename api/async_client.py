@@ -0,0 +1,337 @@
+"""
+Asynchronous API client for Maple Story Universe (MSU) API
+
+Mirrors MSUApiClient with coroutines on top of a single pooled aiohttp
+ClientSession, so hundreds of lookups can share one event loop. Requests
+are paced and retried by the same RequestScheduler as the threaded client
+(pass the threaded client's scheduler to share its rate budget) and are
+recorded in an ApiMetrics collector.
+"""
+
+import asyncio
+import json
+import time
+from typing import Dict, Hashable, Iterable, List, Optional
+
+import aiohttp
+
+from models.character import Character
+from api.api_client import (
+    PRIORITY_BACKGROUND, MSUApiClient, RateLimitError, RequestScheduler, _parse_seconds
+)
+from api.metrics import ApiMetrics, endpoint_label
+from api.singleflight import AsyncSingleFlight, character_key, request_key
+from api.parsing import (
+    parse_character_details, parse_character_summary,
+    parse_ranking_entry, parse_search_entry
+)
+
+
+class AsyncMSUApiClient:
+    """Asyncio client for interacting with MapleStory Universe (MSU) API"""
+
+    MAX_PAGE_SIZE = MSUApiClient.MAX_PAGE_SIZE
+
+    def __init__(self, api_key: str = None, base_url: str = None,
+                 detail_limit: int = 10, max_connections: int = 100,
+                 max_connections_per_host: int = 20, request_timeout: float = 10.0,
+                 scheduler: RequestScheduler = None, metrics: ApiMetrics = None,
+                 priority: int = PRIORITY_BACKGROUND):
+        """
+        Args:
+            api_key: MSU API key sent as a bearer token
+            base_url: Base URL of the MSU API
+            detail_limit: Characters ranked at or above this get their
+                equipment fetched by get_top_characters
+            max_connections: Total connections kept by the shared pool
+            max_connections_per_host: Connections allowed to a single host
+            request_timeout: Deadline in seconds for a single API call
+            scheduler: Rate limiter and retry policy for outgoing requests
+            metrics: Collector for request counts, latency, bytes and
+                retries; a new one is created by default
+            priority: Scheduler lane for this client's requests; background
+                by default so a shared scheduler serves interactive
+                requests first
+        """
+        self.api_key = api_key
+        self.base_url = base_url or "https://api.msu.io"
+        self.detail_limit = detail_limit
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.request_timeout = request_timeout
+        self.scheduler = scheduler or RequestScheduler()
+        self.metrics = metrics if metrics is not None else ApiMetrics()
+        self.priority = priority
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Identical GETs awaited at the same time share one request
+        self._inflight = AsyncSingleFlight()
+        # FIFO queue in front of the scheduler's bucket, see _acquire
+        self._pacing: Optional[asyncio.Lock] = None
+        self._pacing_loop: Optional[asyncio.AbstractEventLoop] = None
+        # True when the last get_top_characters fell back to mock data
+        self.using_mock_data = False
+
+        # Set up headers for MSU API
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+
+        if self.api_key:
+            self.headers["Authorization"] = f"Bearer {self.api_key}"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled session, created on first use inside the running event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the pooled session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_json(self, path: str, params: Dict = None, key: Hashable = None):
+        """
+        GET an endpoint and return (status, decoded JSON or None)
+
+        Concurrent calls with the same path and parameters (or the same key,
+        when one is given) share one request and its decoded body, which
+        callers must not modify.
+
+        Raises:
+            RateLimitError: The API still answered 429 after all retries
+        """
+        # aiohttp only accepts string query values
+        params = {key: str(value) for key, value in (params or {}).items()}
+        label = endpoint_label(path)
+        return await self._inflight.do(
+            key or request_key(path, params), lambda: self._fetch_json(path, params),
+            on_shared=lambda: self.metrics.record_coalesced(label))
+
+    async def _fetch_json(self, path: str, params: Dict[str, str]):
+        url = f"{self.base_url}{path}"
+        label = endpoint_label(url)
+        start = time.perf_counter()
+        try:
+            status, headers, body = await self._send(url, label, params)
+        except Exception as e:
+            self.metrics.record_request(label, type(e).__name__, time.perf_counter() - start)
+            raise
+
+        self.metrics.record_request(label, str(status), time.perf_counter() - start)
+        self.metrics.record_bytes(label, len(body))
+        if status == 429:
+            retry_after = _parse_seconds(headers.get('Retry-After'))
+            raise RateLimitError(f"MSU API rate limit exceeded for {url}", retry_after)
+        if status == 200:
+            return status, json.loads(body) if body else None
+        return status, body.decode('utf-8', errors='replace')
+
+    async def _send(self, url: str, label: str, params: Dict[str, str]):
+        """
+        GET url through the scheduler and return (status, headers, body)
+
+        Retries follow ScheduledAdapter: connection errors and 429/5xx are
+        retried with backoff, Retry-After is capped at the scheduler's
+        backoff_max, and a 429 pauses the whole bucket.
+        """
+        scheduler = self.scheduler
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            await self._acquire()
+            try:
+                async with self.session.get(url, params=params) as response:
+                    scheduler.observe(response)
+                    status = response.status
+                    delay = self._retry_delay(response, attempt, started)
+                    if delay is None:
+                        return status, response.headers, await response.read()
+            except aiohttp.ClientConnectionError:
+                if attempt >= scheduler.max_retries:
+                    raise
+                self.metrics.record_retry(label, "connection")
+                await asyncio.sleep(scheduler.backoff(attempt))
+                attempt += 1
+                continue
+
+            self.metrics.record_retry(label, str(status))
+            if status == 429:
+                # Throttling applies to every request; _acquire waits out the pause
+                scheduler.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, response: aiohttp.ClientResponse, attempt: int,
+                     started: float) -> Optional[float]:
+        """Seconds to wait before retrying response, or None if it is final"""
+        scheduler = self.scheduler
+        if response.status not in scheduler.RETRY_STATUSES or attempt >= scheduler.max_retries:
+            return None
+        retry_after = _parse_seconds(response.headers.get('Retry-After'))
+        if retry_after is None:
+            return scheduler.backoff(attempt)
+        delay = min(retry_after, scheduler.backoff_max)
+        if retry_after > self.request_timeout - (time.monotonic() - started):
+            # Waiting would overrun the deadline; leave the retry to the caller
+            if response.status == 429:
+                scheduler.pause(delay)
+            return None
+        return delay
+
+    async def _acquire(self):
+        """
+        Wait for a token from the scheduler's bucket without blocking the loop
+
+        Waiters queue on a lock in arrival order, so only the one at the head
+        sleeps until the next token is due instead of every waiter waking up
+        to compete for it.
+        """
+        async with self._pacing_lock():
+            while True:
+                wait = self.scheduler.try_acquire(self.priority)
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+    def _pacing_lock(self) -> asyncio.Lock:
+        # A lock belongs to one event loop; start a new one for a new loop
+        loop = asyncio.get_running_loop()
+        if self._pacing is None or self._pacing_loop is not loop:
+            self._pacing = asyncio.Lock()
+            self._pacing_loop = loop
+        return self._pacing
+
+    async def get_top_characters(self, limit: int = 100, world: str = None) -> List[Character]:
+        """
+        Get top characters by ranking from MSU API
+
+        Args:
+            limit: Number of characters to return
+            world: Specific world to get rankings from (optional)
+        """
+        try:
+            params = {
+                'limit': min(limit, self.MAX_PAGE_SIZE),
+                'type': 'overall'  # overall, level, fame, etc.
+            }
+            if world:
+                params['world'] = world
+
+            status, data = await self._get_json("/v1/characters/rankings", params)
+
+            if status == 200:
+                characters = [parse_ranking_entry(rank_data, world)
+                              for rank_data in data.get('rankings', [])][:limit]
+
+                # Get detailed character info for the top ranks
+                detailed = [char for char in characters if char.rank <= self.detail_limit]
+                summaries = await asyncio.gather(
+                    *(self._get_character_details(char.name, world) for char in detailed)
+                )
+                for char, char_details in zip(detailed, summaries):
+                    if char_details:
+                        char.avatar_url = char_details.get('avatar_url', char.avatar_url)
+                        char.equipment = char_details.get('equipment', {})
+
+                self.using_mock_data = False
+                return characters
+            else:
+                print(f"MSU API Error: {status}")
+                print(f"Response: {data}")
+                self.using_mock_data = True
+                self.metrics.record_mock_fallback('get_top_characters')
+                return MSUApiClient._get_mock_characters(limit)
+
+        except RateLimitError:
+            # Throttling is temporary; report it instead of showing fake data
+            raise
+        except Exception as e:
+            print(f"Error getting top characters from MSU API: {str(e)}")
+            self.using_mock_data = True
+            self.metrics.record_mock_fallback('get_top_characters')
+            return MSUApiClient._get_mock_characters(limit)
+
+    async def _get_character_details(self, character_name: str, world: str = None) -> Optional[Dict]:
+        """Get detailed character information from MSU API"""
+        try:
+            params = {'world': world} if world else None
+            status, data = await self._get_json(f"/v1/characters/{character_name}", params,
+                                                key=character_key(character_name, world))
+            if status == 200:
+                return parse_character_summary(data)
+        except Exception as e:
+            print(f"Error getting character details for {character_name}: {str(e)}")
+
+        return None
+
+    async def get_character_details(self, character_name: str) -> Optional[Character]:
+        """Get detailed information about a specific character"""
+        try:
+            status, data = await self._get_json(f"/v1/characters/{character_name}",
+                                                key=character_key(character_name))
+            if status == 200:
+                return parse_character_details(data, character_name)
+        except Exception as e:
+            print(f"Error getting character details: {str(e)}")
+
+        return None
+
+    async def get_many_character_details(self, character_names: Iterable[str]) -> List[Optional[Character]]:
+        """Look up many characters concurrently; results follow the input order"""
+        return await asyncio.gather(
+            *(self.get_character_details(name) for name in character_names)
+        )
+
+    async def search_characters(self, query: str, world: str = None,
+                                limit: int = None) -> List[Character]:
+        """
+        Search for characters by name using MSU API
+
+        limit defaults to MSUApiClient.SEARCH_LIMIT.
+        """
+        try:
+            params = {
+                'q': query,
+                'limit': limit or MSUApiClient.SEARCH_LIMIT
+            }
+            if world:
+                params['world'] = world
+
+            status, data = await self._get_json("/v1/characters/search", params)
+            if status == 200:
+                return [parse_search_entry(char_data, world)
+                        for char_data in data.get('characters', [])]
+        except Exception as e:
+            print(f"Error searching characters: {str(e)}")
+
+        return []
+
+    async def get_worlds(self) -> List[str]:
+        """Get available worlds from MSU API"""
+        try:
+            status, data = await self._get_json("/v1/worlds")
+            if status == 200:
+                return [world.get('name') for world in data.get('worlds', [])]
+        except Exception as e:
+            print(f"Error getting worlds: {str(e)}")
+
+        return []
@@ -0,0 +1,364 @@
+"""
+HTTP response cache for the MSU API client
+
+Responses are kept in an in-memory LRU in front of an optional on-disk store.
+Each endpoint has its own time-to-live; once an entry goes stale it is
+revalidated with If-None-Match/If-Modified-Since instead of being refetched.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Still importable from here; it moved to api.paths to keep that module light
+from api.paths import default_cache_dir, prune_cache_dir
+
+
+# Seconds a response stays fresh, matched by longest path prefix
+DEFAULT_TTLS = {
+    "/v1/worlds": 24 * 60 * 60,
+    "/v1/characters/rankings": 60,
+    "/v1/characters/search": 60,
+    "/v1/characters/": 5 * 60,
+}
+
+
+@dataclass
+class CacheEntry:
+    """A cached HTTP response"""
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    expires_at: float
+    stored_at: float = field(default_factory=time.time)
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def is_fresh(self, now: float = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate this entry"""
+        headers = CaseInsensitiveDict(self.headers)
+        validators = {}
+        if headers.get("ETag"):
+            validators["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a requests.Response served from this entry"""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = self.url
+        response.reason = "OK"
+        response._content = self.content
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """
+    Two-level response cache: memory LRU backed by an optional disk store
+
+    Args:
+        cache_dir: Directory for the on-disk store; None keeps entries in memory only
+        max_entries: Number of entries held in the memory LRU
+        max_entry_bytes: Responses larger than this are not cached
+        ttls: Path prefix to freshness lifetime (seconds); defaults to DEFAULT_TTLS
+        default_ttl: Lifetime for paths not matched by ttls; 0 disables caching them
+        max_disk_bytes: Size the disk store is pruned back to, oldest entries first
+        max_disk_age: Disk entries written longer ago than this (seconds) are deleted
+    """
+
+    def __init__(self, cache_dir: str = None, max_entries: int = 512,
+                 max_entry_bytes: int = 2 * 1024 * 1024,
+                 ttls: Dict[str, float] = None, default_ttl: float = 0,
+                 max_disk_bytes: int = 256 * 1024 * 1024,
+                 max_disk_age: float = 7 * 24 * 60 * 60):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self.default_ttl = default_ttl
+        # Longest prefix first so "/v1/characters/rankings" wins over "/v1/characters/"
+        ttls = DEFAULT_TTLS if ttls is None else ttls
+        self._ttls: List[Tuple[str, float]] = sorted(ttls.items(), key=lambda kv: -len(kv[0]))
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_age = max_disk_age
+        # Approximate bytes in the disk store; recounted whenever it is pruned
+        self._disk_bytes = 0
+        self._pruning = False
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._disk_bytes = prune_cache_dir(self.cache_dir, max_disk_bytes,
+                                               max_disk_age, suffix=".entry")
+
+    def ttl_for(self, url: str) -> float:
+        """Freshness lifetime for a URL, based on its path"""
+        path = urlsplit(url).path
+        for prefix, ttl in self._ttls:
+            if path.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry (fresh or stale) in memory, then on disk"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            with self._lock:
+                self._remember(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        """Store an entry in memory and on disk"""
+        if entry.size > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(".entry"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, filename))
+                    except OSError:
+                        pass
+
+    def record(self, outcome: str):
+        """Count a lookup outcome: 'hit', 'miss' or 'revalidate'"""
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "revalidate":
+                self.revalidations += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/revalidate counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "entries": len(self._memory),
+                "bytes": sum(entry.size for entry in self._memory.values()),
+            }
+
+    def _remember(self, key: str, entry: CacheEntry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.entry")
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                meta = json.loads(f.readline().decode("utf-8"))
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return CacheEntry(
+            url=meta["url"],
+            status_code=meta["status_code"],
+            headers=meta["headers"],
+            content=content,
+            expires_at=meta["expires_at"],
+            stored_at=meta["stored_at"],
+        )
+
+    def _write_disk(self, key: str, entry: CacheEntry):
+        if not self.cache_dir:
+            return
+        meta = {
+            "key": key,
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "expires_at": entry.expires_at,
+            "stored_at": entry.stored_at,
+        }
+        try:
+            # Write to a temp file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode("utf-8") + b"\n")
+                f.write(entry.content)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Error writing response cache entry: {str(e)}")
+            return
+
+        with self._lock:
+            # Overwritten entries are counted twice; the next prune recounts
+            self._disk_bytes += entry.size
+            if self._disk_bytes <= self.max_disk_bytes or self._pruning:
+                return
+            self._pruning = True
+        used = prune_cache_dir(self.cache_dir, self.max_disk_bytes,
+                               self.max_disk_age, suffix=".entry")
+        with self._lock:
+            self._disk_bytes = used
+            self._pruning = False
+
+
+class _TeeReader:
+    """
+    Wraps a streamed response's raw reader and copies what passes through
+
+    Once the body has been read to the end, on_complete is called with the
+    full content. Bodies larger than limit are not kept.
+    """
+
+    def __init__(self, raw, on_complete, limit: int):
+        self._raw = raw
+        self._on_complete = on_complete
+        self._limit = limit
+        self._buffer: Optional[bytearray] = bytearray()
+
+    def _keep(self, chunk: bytes):
+        if self._buffer is not None and chunk:
+            if len(self._buffer) + len(chunk) > self._limit:
+                self._buffer = None
+            else:
+                self._buffer += chunk
+
+    def _finish(self):
+        if self._buffer is not None:
+            content, self._buffer = bytes(self._buffer), None
+            self._on_complete(content)
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._keep(chunk)
+            yield chunk
+        self._finish()
+
+    def read(self, amt=None, *args, **kwargs):
+        chunk = self._raw.read(amt, *args, **kwargs)
+        self._keep(chunk)
+        if not chunk or amt is None:
+            self._finish()
+        return chunk
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class CachingSession(requests.Session):
+    """
+    requests.Session that serves GET requests through a ResponseCache
+
+    Responses to cacheable requests carry a cache_outcome attribute: 'hit',
+    'revalidate' or 'miss'.
+    """
+
+    # Response headers worth keeping with a cached entry
+    KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date", "Cache-Control")
+
+    def __init__(self, cache: ResponseCache = None):
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        ttl = self.cache.ttl_for(url) if self.cache is not None else 0
+        if method.upper() != "GET" or ttl <= 0:
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        key = requests.Request(method, url, params=params).prepare().url
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh():
+            self.cache.record("hit")
+            response = entry.to_response()
+            response.cache_outcome = "hit"
+            return response
+
+        if entry is not None:
+            headers = dict(headers or {})
+            headers.update(entry.validators())
+
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.record("revalidate")
+            refreshed = CacheEntry(
+                url=entry.url,
+                status_code=entry.status_code,
+                headers={**entry.headers, **self._kept_headers(response)},
+                content=entry.content,
+                expires_at=time.time() + ttl,
+            )
+            self.cache.set(key, refreshed)
+            # Hand a streamed response's connection back to the pool now
+            # rather than when the object is garbage-collected
+            response.close()
+            response = refreshed.to_response()
+            response.cache_outcome = "revalidate"
+            return response
+
+        self.cache.record("miss")
+        response.cache_outcome = "miss"
+        if (response.status_code == 200
+                and "no-store" not in response.headers.get("Cache-Control", "")):
+            def store(content: bytes):
+                self.cache.set(key, CacheEntry(
+                    url=response.url,
+                    status_code=response.status_code,
+                    headers=self._kept_headers(response),
+                    content=content,
+                    expires_at=time.time() + ttl,
+                ))
+
+            if kwargs.get("stream"):
+                # Store the body once the caller has read it through
+                response.raw = _TeeReader(response.raw, store, self.cache.max_entry_bytes)
+            else:
+                store(response.content)
+        return response
+
+    def _kept_headers(self, response: requests.Response) -> Dict[str, str]:
+        return {name: response.headers[name] for name in self.KEPT_HEADERS
+                if name in response.headers}
@@ -0,0 +1,132 @@
+"""
+Multi-world ranking crawl merged into a single global leaderboard
+
+Every world's rankings are walked in parallel with MSUApiClient.iter_rankings
+and combined with a streaming k-way merge, so the global top N is available
+without downloading every world in full or sorting everything at the end.
+"""
+
+import heapq
+import queue
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from api.api_client import MSUApiClient, PRIORITY_BACKGROUND
+from models.character import Character
+
+
+def leaderboard_key(char: Character) -> Tuple[int, int]:
+    """Sort key of the global leaderboard: highest level first, then highest exp"""
+    return -(char.level or 0), -(char.exp or 0)
+
+
+class _WorldFeed:
+    """
+    Walks one world's rankings on a background thread
+
+    Rows are handed over through a small bounded queue, so each world is
+    fetched only a few pages ahead of the merge.
+    """
+
+    _DONE = object()
+
+    def __init__(self, client: MSUApiClient, world: str, max_rows: Optional[int],
+                 page_size: int, ranking_type: str, priority: int,
+                 stop: threading.Event, buffer_rows: int):
+        self.world = world
+        self._queue: "queue.Queue" = queue.Queue(maxsize=buffer_rows)
+        self._stop = stop
+        self._thread = threading.Thread(
+            target=self._run, name=f"msu-crawl-{world}", daemon=True,
+            args=(client, max_rows, page_size, ranking_type, priority))
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, client, max_rows, page_size, ranking_type, priority):
+        rows = client.iter_rankings(world=self.world, page_size=page_size,
+                                    max_rows=max_rows, ranking_type=ranking_type,
+                                    priority=priority)
+        try:
+            for char in rows:
+                if char.world is None:
+                    char.world = self.world
+                if not self._put(char):
+                    return
+        except Exception as e:
+            self._put(e)
+            return
+        finally:
+            rows.close()
+        self._put(self._DONE)
+
+    def __iter__(self) -> Iterator[Character]:
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+def iter_global_leaderboard(client: MSUApiClient, worlds: Iterable[str] = None,
+                            limit: int = None, page_size: int = 100,
+                            ranking_type: str = 'overall',
+                            priority: int = PRIORITY_BACKGROUND,
+                            buffer_rows: int = 200) -> Iterator[Tuple[int, Character]]:
+    """
+    Yield (global_rank, character) across all worlds, best first
+
+    Each world's rankings are assumed to be ordered by level and then exp,
+    which is what lets heapq.merge combine them lazily. With a limit, no
+    world is read past that many rows since the global top N cannot hold
+    more than N rows from one world. An error in any world is raised to the
+    caller; stopping iteration early stops all world fetches.
+
+    Args:
+        client: Client used for every world (shares its rate limit and cache)
+        worlds: Worlds to include (defaults to client.get_worlds())
+        limit: Number of leaderboard rows to produce (optional)
+        page_size: Rows requested per page
+        ranking_type: Ranking to walk in each world
+        priority: Scheduler lane for the page requests
+        buffer_rows: Rows each world may fetch ahead of the merge
+
+    Raises:
+        ValueError: No worlds were given and the API returned none
+    """
+    world_list: List[str] = list(worlds) if worlds is not None else client.get_worlds()
+    if not world_list:
+        raise ValueError("No worlds to crawl")
+
+    stop = threading.Event()
+    feeds = [_WorldFeed(client, world, limit, page_size, ranking_type, priority,
+                        stop, buffer_rows)
+             for world in world_list]
+    try:
+        merged = heapq.merge(*feeds, key=leaderboard_key)
+        for global_rank, char in enumerate(merged, start=1):
+            yield global_rank, char
+            if limit is not None and global_rank >= limit:
+                return
+    finally:
+        stop.set()
+
+
+def get_global_leaderboard(client: MSUApiClient, worlds: Iterable[str] = None,
+                           limit: Optional[int] = 100) -> List[Tuple[int, Character]]:
+    """
+    Global top characters across all worlds as a list of (global_rank, character)
+
+    With limit None every row of every world is returned.
+    """
+    page_size = min(limit or client.MAX_PAGE_SIZE, client.MAX_PAGE_SIZE)
+    return list(iter_global_leaderboard(client, worlds, limit=limit, page_size=page_size))
@@ -0,0 +1,348 @@
+"""
+Request metrics for the MSU API client
+
+ApiMetrics counts every API call by endpoint and status and keeps latency
+histograms, bytes received, retries, cache outcomes, calls that joined an
+identical in-flight request, and mock-data fallbacks.
+The numbers are available as a dictionary (snapshot), in the Prometheus text
+exposition format (to_prometheus) and as a one-line summary for status bars.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Endpoints reported under their own path; other character paths are
+# folded into one label so every character name does not get its own series
+_FIXED_ENDPOINTS = ("/v1/worlds", "/v1/characters/rankings", "/v1/characters/search")
+_CHARACTER_ENDPOINT = "/v1/characters/{name}"
+
+
+def endpoint_label(url: str) -> str:
+    """Endpoint template for a request URL, e.g. /v1/characters/{name}"""
+    path = urlsplit(url).path
+    # Ignore any path prefix of the base URL
+    start = path.find("/v1/")
+    if start > 0:
+        path = path[start:]
+    path = path.rstrip("/") or "/"
+    if path in _FIXED_ENDPOINTS:
+        return path
+    if path.startswith("/v1/characters/"):
+        return _CHARACTER_ENDPOINT
+    return path
+
+
+def is_error_status(status: str) -> bool:
+    """Whether a recorded status (HTTP code or exception name) counts as an error"""
+    return not (status.startswith("2") or status == "304")
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        # One count per bound plus the +Inf bucket, not cumulative
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram"):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs including +Inf"""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return pairs
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating inside its bucket
+
+        Values in the +Inf bucket are reported as the largest finite bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        total = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and total + count >= rank:
+                return lower + (bound - lower) * (rank - total) / count
+            total += count
+            lower = bound
+        return self.bounds[-1]
+
+
+class ApiMetrics:
+    """
+    Thread-safe counters and histograms for API traffic
+
+    Latency is the time from sending a request (including waiting for the
+    rate limiter and retries) until the response headers arrived; it is only
+    recorded for calls that went to the network, not for cache hits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._requests: Dict[Tuple[str, str], int] = defaultdict(int)
+            self._latency: Dict[Tuple[str, str], Histogram] = {}
+            self._bytes: Dict[str, int] = defaultdict(int)
+            self._retries: Dict[Tuple[str, str], int] = defaultdict(int)
+            self._cache: Dict[Tuple[str, str], int] = defaultdict(int)
+            self._coalesced: Dict[str, int] = defaultdict(int)
+            self._mock_fallbacks: Dict[str, int] = defaultdict(int)
+
+    def record_request(self, endpoint: str, status: str, seconds: Optional[float] = None):
+        """Count one API call; seconds is None for calls answered from the cache"""
+        with self._lock:
+            self._requests[endpoint, status] += 1
+            if seconds is not None:
+                histogram = self._latency.get((endpoint, status))
+                if histogram is None:
+                    histogram = self._latency[endpoint, status] = Histogram()
+                histogram.observe(seconds)
+
+    def record_bytes(self, endpoint: str, count: int):
+        with self._lock:
+            self._bytes[endpoint] += count
+
+    def record_retry(self, endpoint: str, reason: str):
+        """Count a retried attempt; reason is the HTTP status or 'connection'"""
+        with self._lock:
+            self._retries[endpoint, reason] += 1
+
+    def record_cache(self, endpoint: str, outcome: str):
+        """Count a cache lookup outcome: 'hit', 'miss' or 'revalidate'"""
+        with self._lock:
+            self._cache[endpoint, outcome] += 1
+
+    def record_coalesced(self, endpoint: str):
+        """Count a call that shared an identical request already in flight"""
+        with self._lock:
+            self._coalesced[endpoint] += 1
+
+    def record_mock_fallback(self, method: str):
+        with self._lock:
+            self._mock_fallbacks[method] += 1
+
+    def counting_reader(self, raw, endpoint: str) -> "_CountingReader":
+        """Wrap a response's raw reader so the body bytes read are recorded"""
+        return _CountingReader(raw, self, endpoint)
+
+    def snapshot(self) -> Dict:
+        """
+        All metrics as plain data, grouped by endpoint
+
+        Latency entries hold count, sum_s, p50_s, p95_s and cumulative
+        buckets keyed by their upper bound.
+        """
+        with self._lock:
+            endpoints: Dict[str, Dict] = {}
+
+            def entry(endpoint: str) -> Dict:
+                if endpoint not in endpoints:
+                    endpoints[endpoint] = {"requests": {}, "latency": {}, "bytes": 0,
+                                           "retries": {}, "cache": {}, "coalesced": 0}
+                return endpoints[endpoint]
+
+            for (endpoint, status), count in self._requests.items():
+                entry(endpoint)["requests"][status] = count
+            for (endpoint, status), histogram in self._latency.items():
+                entry(endpoint)["latency"][status] = {
+                    "count": histogram.count,
+                    "sum_s": histogram.sum,
+                    "p50_s": histogram.quantile(0.5),
+                    "p95_s": histogram.quantile(0.95),
+                    "buckets": dict(histogram.cumulative()),
+                }
+            for endpoint, count in self._bytes.items():
+                entry(endpoint)["bytes"] = count
+            for (endpoint, reason), count in self._retries.items():
+                entry(endpoint)["retries"][reason] = count
+            for (endpoint, outcome), count in self._cache.items():
+                entry(endpoint)["cache"][outcome] = count
+            for endpoint, count in self._coalesced.items():
+                entry(endpoint)["coalesced"] = count
+
+            return {
+                "started_at": self.started_at,
+                "endpoints": endpoints,
+                "mock_fallbacks": dict(self._mock_fallbacks),
+                "totals": {
+                    "requests": sum(self._requests.values()),
+                    "errors": sum(count for (_, status), count in self._requests.items()
+                                  if is_error_status(status)),
+                    "retries": sum(self._retries.values()),
+                    "bytes": sum(self._bytes.values()),
+                    "cache_hits": sum(count for (_, outcome), count in self._cache.items()
+                                      if outcome == "hit"),
+                    "coalesced": sum(self._coalesced.values()),
+                    "mock_fallbacks": sum(self._mock_fallbacks.values()),
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "msu_api") -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def sample(name: str, labels: Dict[str, str], value):
+            label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+            lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+        with self._lock:
+            family("requests_total", "counter", "API calls by endpoint and status")
+            for (endpoint, status), count in sorted(self._requests.items()):
+                sample("requests_total", {"endpoint": endpoint, "status": status}, count)
+
+            family("request_duration_seconds", "histogram",
+                   "Time until response headers for calls that went to the network")
+            for (endpoint, status), histogram in sorted(self._latency.items()):
+                labels = {"endpoint": endpoint, "status": status}
+                for le, count in histogram.cumulative():
+                    sample("request_duration_seconds_bucket", {**labels, "le": le}, count)
+                sample("request_duration_seconds_sum", labels, repr(histogram.sum))
+                sample("request_duration_seconds_count", labels, histogram.count)
+
+            family("response_bytes_total", "counter", "Response body bytes received")
+            for endpoint, count in sorted(self._bytes.items()):
+                sample("response_bytes_total", {"endpoint": endpoint}, count)
+
+            family("retries_total", "counter", "Retried attempts by endpoint and reason")
+            for (endpoint, reason), count in sorted(self._retries.items()):
+                sample("retries_total", {"endpoint": endpoint, "reason": reason}, count)
+
+            family("cache_lookups_total", "counter", "Response cache lookups by outcome")
+            for (endpoint, outcome), count in sorted(self._cache.items()):
+                sample("cache_lookups_total", {"endpoint": endpoint, "outcome": outcome}, count)
+
+            family("coalesced_total", "counter", "Calls that joined an identical request in flight")
+            for endpoint, count in sorted(self._coalesced.items()):
+                sample("coalesced_total", {"endpoint": endpoint}, count)
+
+            family("mock_fallbacks_total", "counter", "Times mock data was returned instead")
+            for method, count in sorted(self._mock_fallbacks.items()):
+                sample("mock_fallbacks_total", {"method": method}, count)
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """One line for a status bar, e.g. '42 requests, p95 180 ms, 30% cached'"""
+        with self._lock:
+            requests_total = sum(self._requests.values())
+            if not requests_total:
+                return "no API requests yet"
+            latency = Histogram()
+            for histogram in self._latency.values():
+                latency.merge(histogram)
+            errors = sum(count for (_, status), count in self._requests.items()
+                         if is_error_status(status))
+            retries = sum(self._retries.values())
+            hits = sum(count for (_, outcome), count in self._cache.items() if outcome == "hit")
+            received = sum(self._bytes.values())
+            coalesced = sum(self._coalesced.values())
+            mock = sum(self._mock_fallbacks.values())
+
+        parts = [f"{requests_total} requests"]
+        p95 = latency.quantile(0.95)
+        if p95 is not None:
+            parts.append(f"p95 {p95 * 1000:.0f} ms")
+        parts.append(f"{hits * 100 // requests_total}% cached")
+        parts.append(_format_bytes(received))
+        if coalesced:
+            parts.append(f"{coalesced} coalesced")
+        if retries:
+            parts.append(f"{retries} retries")
+        if errors:
+            parts.append(f"{errors} errors")
+        if mock:
+            parts.append(f"{mock} mock fallbacks")
+        return ", ".join(parts)
+
+    def endpoint_summaries(self) -> List[str]:
+        """One line per endpoint with call count and latency percentiles"""
+        with self._lock:
+            calls: Dict[str, int] = defaultdict(int)
+            latency: Dict[str, Histogram] = defaultdict(Histogram)
+            for (endpoint, _), count in self._requests.items():
+                calls[endpoint] += count
+            for (endpoint, _), histogram in self._latency.items():
+                latency[endpoint].merge(histogram)
+
+        lines = []
+        for endpoint in sorted(calls):
+            line = f"{endpoint}: {calls[endpoint]} calls"
+            histogram = latency.get(endpoint)
+            if histogram is not None and histogram.count:
+                line += (f", p50 {histogram.quantile(0.5) * 1000:.0f} ms"
+                         f", p95 {histogram.quantile(0.95) * 1000:.0f} ms")
+            lines.append(line)
+        return lines
+
+
+class _CountingReader:
+    """Wraps a response's raw reader and records the body bytes read through it"""
+
+    def __init__(self, raw, metrics: ApiMetrics, endpoint: str):
+        self._raw = raw
+        self._metrics = metrics
+        self._endpoint = endpoint
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._metrics.record_bytes(self._endpoint, len(chunk))
+            yield chunk
+
+    def read(self, amt=None, *args, **kwargs):
+        chunk = self._raw.read(amt, *args, **kwargs)
+        if chunk:
+            self._metrics.record_bytes(self._endpoint, len(chunk))
+        return chunk
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_bytes(count: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
@@ -0,0 +1,154 @@
+"""
+Persistent index of every character name the client has seen
+
+Names from rankings, character lookups and searches are kept in a list
+sorted by their normalized form, so prefix completion is a binary search.
+With a path, the index is loaded from (and new names are appended to) a
+text file of "world<TAB>name" lines, rewritten sorted and deduplicated the
+next time it is loaded.
+"""
+
+import bisect
+import os
+import tempfile
+import threading
+from typing import Iterable, List, Set, Tuple
+
+from models.character import Character
+from models.search_index import normalize_key
+
+# (normalized name, name, world); world is "" when unknown
+NameEntry = Tuple[str, str, str]
+
+
+class NameIndex:
+    """
+    Sorted prefix index over character names
+
+    The index also remembers which search queries the API answered in full
+    (fewer results than the page limit): every name matching such a query
+    has been added, so completions for any prefix extending it can be
+    answered locally. That knowledge is kept for the session only, since
+    new characters appear over time.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: List[NameEntry] = []
+        self._known: Set[Tuple[str, str]] = set()
+        # (normalized query, world) pairs the search endpoint answered in full
+        self._exhausted: Set[Tuple[str, str]] = set()
+        self._loaded = path is None
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    def add(self, characters: Iterable[Character]):
+        """Add the names of characters not seen before"""
+        new_entries = []
+        with self._lock:
+            self._ensure_loaded()
+            for char in characters:
+                name = char.name
+                world = char.world or ""
+                if not name or "\t" in name or "\n" in name or (name, world) in self._known:
+                    continue
+                self._known.add((name, world))
+                new_entries.append((normalize_key(name), name, world))
+            if not new_entries:
+                return
+            # Two sorted runs, which list.sort merges in linear time
+            new_entries.sort()
+            self._entries.extend(new_entries)
+            self._entries.sort()
+            self._append(new_entries)
+
+    def complete(self, prefix: str, world: str = None, limit: int = 10) -> List[str]:
+        """Up to limit names starting with prefix (case-insensitive), in key order"""
+        key = normalize_key(prefix.strip())
+        if not key or limit <= 0:
+            return []
+        names = []
+        with self._lock:
+            self._ensure_loaded()
+            entries = self._entries
+            position = bisect.bisect_left(entries, (key,))
+            while position < len(entries) and len(names) < limit:
+                entry_key, name, entry_world = entries[position]
+                if not entry_key.startswith(key):
+                    break
+                if (world is None or entry_world == world) and name not in names:
+                    names.append(name)
+                position += 1
+        return names
+
+    def mark_exhausted(self, query: str, world: str = None):
+        """Record that a search for query returned every matching character"""
+        key = normalize_key(query.strip())
+        if key:
+            with self._lock:
+                self._exhausted.add((key, world or ""))
+
+    def is_exhausted(self, prefix: str, world: str = None) -> bool:
+        """True if every name starting with prefix is already in the index"""
+        key = normalize_key(prefix.strip())
+        with self._lock:
+            for end in range(1, len(key) + 1):
+                # A search across all worlds covers every single world too
+                if (key[:end], "") in self._exhausted:
+                    return True
+                if world and (key[:end], world) in self._exhausted:
+                    return True
+        return False
+
+    def _ensure_loaded(self):
+        # Called with the lock held
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Error reading name index: {str(e)}")
+            return
+
+        for line in lines:
+            world, _, name = line.partition("\t")
+            if name and (name, world) not in self._known:
+                self._known.add((name, world))
+                self._entries.append((normalize_key(name), name, world))
+        self._entries.sort()
+        # Names appended since the last load, or duplicates: store it compacted
+        if len(self._entries) != len(lines) or self._file_lines() != lines:
+            self._rewrite()
+
+    def _file_lines(self) -> List[str]:
+        return [f"{world}\t{name}" for _, name, world in self._entries]
+
+    def _append(self, entries: List[NameEntry]):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(f"{world}\t{name}\n" for _, name, world in entries)
+        except OSError as e:
+            print(f"Error writing name index: {str(e)}")
+
+    def _rewrite(self):
+        try:
+            # Write to a temp file first so a crash never leaves a partial index
+            directory = os.path.dirname(self.path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.writelines(line + "\n" for line in self._file_lines())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error writing name index: {str(e)}")
@@ -0,0 +1,87 @@
+"""
+Parsing of MSU API payloads into model objects
+
+Shared by the synchronous and asynchronous API clients so every code path
+builds Character and Item objects the same way.
+"""
+
+from typing import Dict, List, Optional
+from models.character import Character
+from models.item import Item
+from models.item_catalog import ItemCatalog, get_item_catalog
+
+
+def parse_ranking_entry(rank_data: Dict, world: str = None) -> Character:
+    """
+    Build a Character from a single rankings row
+
+    world is used when the row itself does not name the character's world
+    (e.g. the world the rankings were requested for).
+    """
+    return Character(
+        rank=rank_data.get('rank', 0),
+        name=rank_data.get('name', 'Unknown'),
+        level=rank_data.get('level', 0),
+        job=rank_data.get('job', 'Unknown'),
+        guild=rank_data.get('guild'),
+        popularity=rank_data.get('fame', 0),
+        avatar_url=rank_data.get('avatar_url'),
+        world=rank_data.get('world') or world,
+        exp=rank_data.get('exp') or 0
+    )
+
+
+def parse_search_entry(char_data: Dict, world: str = None) -> Character:
+    """Build a Character from a single search result"""
+    return Character(
+        rank=0,  # Search results don't include rank
+        name=char_data.get('name', 'Unknown'),
+        level=char_data.get('level', 0),
+        job=char_data.get('job', 'Unknown'),
+        guild=char_data.get('guild'),
+        popularity=char_data.get('fame', 0),
+        avatar_url=char_data.get('avatar_url'),
+        world=char_data.get('world') or world
+    )
+
+
+def parse_equipment(equipment_data: Optional[List[Dict]],
+                    catalog: ItemCatalog = None) -> Dict[str, Item]:
+    """
+    Build the slot -> Item mapping from a character's equipment list
+
+    Items come from catalog (the shared catalog by default), so characters
+    wearing the same gear share Item objects.
+    """
+    if catalog is None:
+        catalog = get_item_catalog()
+    equipment = {}
+    for item_data in equipment_data or []:
+        slot = item_data.get('slot', 'unknown')
+        equipment[slot] = catalog.item(item_data, slot)
+    return equipment
+
+
+def parse_character_summary(data: Dict) -> Dict:
+    """Extract the avatar and equipment used to enrich a ranked character"""
+    return {
+        'avatar_url': data.get('avatar_url'),
+        'equipment': parse_equipment(data.get('equipment'))
+    }
+
+
+def parse_character_details(data: Dict, character_name: str) -> Character:
+    """Build a fully detailed Character from a character lookup"""
+    char = Character(
+        rank=0,  # Rank not available in single character lookup
+        name=data.get('name', character_name),
+        level=data.get('level', 0),
+        job=data.get('job', 'Unknown'),
+        guild=data.get('guild'),
+        popularity=data.get('fame', 0),
+        avatar_url=data.get('avatar_url'),
+        world=data.get('world'),
+        exp=data.get('exp') or 0
+    )
+    char.equipment = parse_equipment(data.get('equipment'))
+    return char
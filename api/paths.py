@@ -0,0 +1,77 @@
+"""
+Filesystem locations and cache housekeeping shared by the GUI and the
+command line tools
+
+Kept free of third-party imports so the window can find its caches without
+loading the HTTP stack first.
+"""
+
+import os
+import time
+
+
+def default_cache_dir() -> str:
+    """Directory used for on-disk caches (overridable with MSU_CACHE_DIR)"""
+    override = os.getenv("MSU_CACHE_DIR")
+    if override:
+        return override
+    if os.name == "nt":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "msu_api_test")
+
+
+def prune_cache_dir(directory: str, max_bytes: int, max_age: float = None,
+                    suffix: str = None) -> int:
+    """
+    Delete old cache files so a directory stays within max_bytes
+
+    Files older than max_age seconds are removed, then the oldest files
+    until the rest fit in 90% of max_bytes (so pruning does not run again
+    on the very next write). Only files ending in suffix are considered;
+    leftover ".tmp" files from interrupted writes go once they are an hour
+    old. Returns the bytes still used.
+    """
+    now = time.time()
+    files = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                age = now - stat.st_mtime
+                if entry.name.endswith(".tmp"):
+                    if age > 60 * 60:
+                        _remove(entry.path)
+                    continue
+                if suffix and not entry.name.endswith(suffix):
+                    continue
+                if max_age is not None and age > max_age:
+                    _remove(entry.path)
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return 0
+
+    used = sum(size for _, size, _ in files)
+    if used > max_bytes:
+        files.sort()
+        for _, size, path in files:
+            if used <= max_bytes * 0.9:
+                break
+            if _remove(path):
+                used -= size
+    return used
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
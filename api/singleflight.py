@@ -0,0 +1,134 @@
+"""
+Coalescing of identical in-flight requests
+
+While a call for a key is running, later callers with the same key wait for
+it and receive its result (or its exception) instead of starting their own.
+Once the call finishes the key is forgotten; completed results are left to
+the response cache.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def request_key(endpoint: str, params: Optional[Dict] = None) -> Tuple:
+    """Key for a GET request that does not depend on parameter order"""
+    items = tuple(sorted((key, str(value)) for key, value in (params or {}).items()
+                         if value is not None))
+    return endpoint, items
+
+
+def character_key(name: str, world: Optional[str] = None) -> Tuple:
+    """
+    Key for a character lookup
+
+    The API matches character names case-insensitively, so "Player1" and
+    "player1" share one request.
+    """
+    return request_key(f"/v1/characters/{name.casefold()}", {'world': world or None})
+
+
+class _Call:
+    """One in-flight call and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Single-flight for thread-based callers
+
+    The result object is handed to every caller, so it should be treated as
+    read-only. The call runs on the first caller's thread with that caller's
+    settings (e.g. its scheduler priority).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any],
+           on_shared: Callable[[], None] = None) -> Any:
+        """
+        Run func for key, or wait for the call already running for key
+
+        on_shared is called when this caller joins a running call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            if on_shared is not None:
+                on_shared()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight for asyncio callers
+
+    The shared call runs as its own task, so a caller that is cancelled does
+    not cancel the request for the others. Calls are tied to the event loop
+    they started on; a caller on another loop starts a fresh call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]],
+                 on_shared: Callable[[], None] = None) -> Any:
+        """
+        Await func() for key, or join the call already running for key
+
+        on_shared is called when this caller joins a running call.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.shared += 1
+            if on_shared is not None:
+                on_shared()
+        else:
+            task = loop.create_task(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Nobody may be left to await it; retrieve the exception so it is not logged
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return sum(1 for task in self._calls.values() if not task.done())
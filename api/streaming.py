@@ -0,0 +1,131 @@
+"""
+Incremental JSON parsing of API responses
+
+Yields the elements of a top-level array (for example "rankings") while the
+response body is still downloading, so memory use does not grow with the
+size of the page and consumers can start before the download completes.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+# Read size used when pulling from a streamed response
+CHUNK_SIZE = 64 * 1024
+
+# Consumed text is dropped from the buffer once it grows past this
+_COMPACT_AT = 256 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Buffer:
+    """Decoded text from a chunk iterator, extended on demand"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; False once the input is exhausted"""
+        if self.eof:
+            return False
+        if self.pos > _COMPACT_AT:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._decoder.decode(chunk)
+                return True
+        self.text += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of streamed JSON")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A value that runs to the end of the buffer (e.g. a number)
+            # may continue in the next chunk
+            if end == len(self.text) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Yield the elements of the array stored under key in a top-level object
+
+    Other members of the object are decoded and skipped. Nothing is yielded
+    if the key is missing.
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+
+    while True:
+        name = buffer.value(decoder)
+        buffer.expect(":")
+        if name == key and buffer.peek() == "[":
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                return
+            while True:
+                yield buffer.value(decoder)
+                if buffer.peek() == ",":
+                    buffer.pos += 1
+                    continue
+                buffer.expect("]")
+                return
+
+        buffer.value(decoder)
+        if buffer.peek() == ",":
+            buffer.pos += 1
+            continue
+        buffer.expect("}")
+        return
+
+
+def iter_response_array(response, key: str) -> Iterator[Any]:
+    """
+    Stream the elements of an array from a requests response opened with stream=True
+
+    The rest of the body is read once the array is done so the connection
+    can be reused (and the response cached). The response is closed when the
+    iteration ends or is abandoned.
+    """
+    chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+    try:
+        yield from iter_json_array(chunks, key)
+        for _ in chunks:
+            pass
+    finally:
+        response.close()
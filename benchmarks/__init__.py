@@ -0,0 +1 @@
+"""Benchmarks for MSU API Test application"""
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the MSU API client and the character table
+
+Runs MSUApiClient end to end against a local stub server and times table
+population under an offscreen Qt platform. Results are written to a JSON file
+that can be passed back with --baseline to compare two runs.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --latency 0.05 --output before.json
+    python -m benchmarks.run_benchmarks --baseline before.json
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+# Allow running as a plain script from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_server import StubConfig, StubMSUServer
+
+
+def measure(func: Callable[[], object], repeat: int, setup: Callable[[], object] = None) -> Dict:
+    """Time func over several runs; setup runs before each run and is not timed"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "runs": repeat,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+    }
+
+
+def make_client(base_url: str, args, cached: bool = False):
+    from api.api_client import MSUApiClient, RequestScheduler
+    client = MSUApiClient(
+        api_key="benchmark",
+        base_url=base_url,
+        max_workers=args.workers,
+        scheduler=RequestScheduler(rate=args.rate, burst=args.workers),
+    )
+    if not cached:
+        client.session.cache = None
+    return client
+
+
+def bench_client(server: StubMSUServer, args) -> Dict[str, Dict]:
+    """End-to-end timings of MSUApiClient against the stub server"""
+    results = {}
+    base_url = server.base_url
+
+    client = make_client(base_url, args)
+    results["refresh_latency_top100"] = measure(
+        lambda: client.get_top_characters(limit=100), args.repeat)
+
+    cached_client = make_client(base_url, args, cached=True)
+    cached_client.get_top_characters(limit=100)
+    results["refresh_latency_top100_cached"] = measure(
+        lambda: cached_client.get_top_characters(limit=100), args.repeat)
+
+    def expire_cache():
+        for entry in cached_client.session.cache._memory.values():
+            entry.expires_at = 0
+    results["refresh_latency_top100_revalidated"] = measure(
+        lambda: cached_client.get_top_characters(limit=100), args.repeat, setup=expire_cache)
+
+    fanout_client = make_client(base_url, args)
+    fanout_client.detail_limit = 100
+    results["detail_fanout_top100"] = measure(
+        lambda: fanout_client.get_top_characters(limit=100), args.repeat)
+
+    results["worlds"] = measure(client.get_worlds, args.repeat)
+    results["search"] = measure(lambda: client.search_characters("Player1"), args.repeat)
+
+    depth = min(args.depth, server.config.rows_per_world)
+    results[f"iter_rankings_{depth}"] = measure(
+        lambda: sum(1 for _ in client.iter_rankings(max_rows=depth)), args.repeat)
+    return results
+
+
+def bench_parsing(server: StubMSUServer, args) -> Dict[str, Dict]:
+    """CPU cost of decoding and parsing payloads, per 1k rows"""
+    from api.parsing import parse_character_details, parse_equipment, parse_ranking_entry
+    from api.streaming import CHUNK_SIZE, iter_json_array
+    from models.item_catalog import ItemCatalog
+
+    results = {}
+    world = server.config.worlds[0]
+    rankings = json.dumps({"rankings": [server.ranking_row(world, rank)
+                                        for rank in range(1, 1001)]}).encode("utf-8")
+    results["parse_rankings_per_1k_rows"] = measure(
+        lambda: [parse_ranking_entry(row) for row in json.loads(rankings)["rankings"]],
+        args.repeat)
+
+    chunks = [rankings[i:i + CHUNK_SIZE] for i in range(0, len(rankings), CHUNK_SIZE)]
+    results["parse_rankings_streamed_per_1k_rows"] = measure(
+        lambda: [parse_ranking_entry(row) for row in iter_json_array(chunks, "rankings")],
+        args.repeat)
+
+    details = [json.dumps(server.character(f"Player{rank}")).encode("utf-8")
+               for rank in range(1, 1001)]
+    results["parse_details_per_1k_rows"] = measure(
+        lambda: [parse_character_details(json.loads(data), "Player") for data in details],
+        args.repeat)
+
+    # Equipment alone (decoding dominates the above), with items shared
+    # through a catalog and with a catalog that keeps nothing
+    equipment = [json.loads(data)["equipment"] for data in details]
+    shared, unshared = ItemCatalog(), ItemCatalog(max_variants=0)
+    results["parse_equipment_per_1k_rows"] = measure(
+        lambda: [parse_equipment(items, shared) for items in equipment], args.repeat)
+    results["parse_equipment_unshared_per_1k_rows"] = measure(
+        lambda: [parse_equipment(items, unshared) for items in equipment], args.repeat)
+    return results
+
+
+def bench_table(server: StubMSUServer, args) -> Dict[str, Dict]:
+    """Time MainWindow.update_character_table under the offscreen Qt platform"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["MSU_API_KEY"] = "benchmark"
+    os.environ["MSU_BASE_URL"] = server.base_url
+
+    from PyQt6.QtWidgets import QApplication
+    from models.character import Character
+    from ui.main_window import MainWindow
+
+    results = {}
+    # Cold import of the window module in a fresh interpreter (includes interpreter start)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results["startup_import_main_window"] = measure(
+        lambda: subprocess.run([sys.executable, "-c", "import ui.main_window"], cwd=root, check=True),
+        args.repeat)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = MainWindow()
+    window.show()
+
+    # Let the initial load (started after the first paint) finish so it does
+    # not overlap the measurements
+    deadline = time.time() + 30
+    while ((window.api_worker is None or window.api_worker.isRunning())
+           and time.time() < deadline):
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+
+    world = server.config.worlds[0]
+    for rows in args.table_rows:
+        characters = [Character(rank=row["rank"], name=row["name"], level=row["level"],
+                                job=row["job"], guild=row["guild"], popularity=row["fame"])
+                      for row in (server.ranking_row(world, rank) for rank in range(1, rows + 1))]
+
+        def populate():
+            window.update_character_table(characters)
+            app.processEvents()
+
+        results[f"table_population_{rows}"] = measure(populate, args.repeat)
+
+        # Refresh where two neighbouring characters swap places
+        refreshed = [dataclasses.replace(char) for char in characters]
+        if rows > 1:
+            refreshed[0].rank, refreshed[1].rank = refreshed[1].rank, refreshed[0].rank
+
+        def refresh():
+            window.refresh_character_table(refreshed)
+            app.processEvents()
+
+        results[f"table_refresh_diff_{rows}"] = measure(
+            refresh, args.repeat, setup=lambda: window.update_character_table(list(characters)))
+
+        # Refresh where 200 pairs of characters anywhere in the table swap places
+        scattered = [dataclasses.replace(char) for char in characters]
+        shuffle = random.Random(rows)
+        for _ in range(200 if rows > 1 else 0):
+            a, b = shuffle.randrange(rows), shuffle.randrange(rows)
+            scattered[a].rank, scattered[b].rank = scattered[b].rank, scattered[a].rank
+
+        def refresh_scattered():
+            window.refresh_character_table(scattered)
+            app.processEvents()
+
+        results[f"table_refresh_scattered_{rows}"] = measure(
+            refresh_scattered, args.repeat,
+            setup=lambda: window.update_character_table(list(characters)))
+
+    # Stepping through characters in the detail panel (19 equipment slots each)
+    from api.parsing import parse_character_details
+    selections = [parse_character_details(server.character(f"Player{rank}"), f"Player{rank}")
+                  for rank in range(1, 101)]
+
+    def select_each():
+        for char in selections:
+            window.character_widget.set_character(char)
+            app.processEvents()
+
+    results["character_widget_select_100"] = measure(select_each, args.repeat)
+    # Let the avatar/icon downloads it started finish before tearing down
+    window.character_widget.image_loader.pool.waitForDone(30000)
+
+    window.close()
+    app.processEvents()
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline_path: str):
+    """Print the change in median time against a previous results file"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+
+    print(f"\nComparison with {baseline_path} (median):")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            print(f"  {name:<40} {result['median_s'] * 1000:10.2f} ms  (new)")
+            continue
+        change = (result["median_s"] - before["median_s"]) / before["median_s"] * 100
+        print(f"  {name:<40} {before['median_s'] * 1000:10.2f} ms -> "
+              f"{result['median_s'] * 1000:10.2f} ms  ({change:+.1f}%)")
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the MSU API client and UI")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write results to")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub server latency per request (s)")
+    parser.add_argument("--rows", type=int, default=10000, help="Ranking rows per world served by the stub")
+    parser.add_argument("--equipment", type=int, default=19, help="Equipment items per character")
+    parser.add_argument("--depth", type=int, default=5000, help="Rows walked by the iter_rankings benchmark")
+    parser.add_argument("--workers", type=int, default=8, help="Client max_workers")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Client rate limit (requests/s)")
+    parser.add_argument("--table-rows", type=int, nargs="+", default=[100, 10000, 100000],
+                        help="Row counts for the table population benchmark")
+    parser.add_argument("--skip-ui", action="store_true", help="Skip the Qt table benchmarks")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+    # Keep benchmark cache files away from the user's real cache
+    os.environ["MSU_CACHE_DIR"] = tempfile.mkdtemp(prefix="msu_bench_")
+
+    config = StubConfig(rows_per_world=args.rows, equipment_per_character=args.equipment,
+                        latency=args.latency)
+    results = {}
+    with StubMSUServer(config) as server:
+        for group in (bench_client, bench_parsing):
+            results.update(group(server, args))
+        if not args.skip_ui:
+            results.update(bench_table(server, args))
+        request_count = server.request_count
+
+    for name, result in results.items():
+        print(f"{name:<40} median {result['median_s'] * 1000:10.2f} ms   "
+              f"min {result['min_s'] * 1000:10.2f} ms")
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items()
+                   if key not in ("output", "baseline")},
+        "stub_requests": request_count,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
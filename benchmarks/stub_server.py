@@ -0,0 +1,193 @@
+"""
+Local stand-in for the MSU API used by the benchmarks
+
+Serves /v1/characters/rankings, /v1/characters/{name}, /v1/characters/search
+and /v1/worlds with synthetic data. Payload sizes and per-request latency are
+configurable, and responses carry an ETag so cache revalidation can be measured.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+JOBS = ["Hero", "Paladin", "Dark Knight", "Bowmaster", "Sniper", "Pathfinder",
+        "Arch Mage (F/P)", "Bishop", "Night Lord", "Shadower", "Buccaneer", "Corsair"]
+GUILDS = ["Cross", "Frozen", "달치즈", "금별", "송이", "반달", "생글", None]
+SLOTS = ["hat", "face", "eye", "overall", "top", "bottom", "shoes", "gloves", "cape",
+         "weapon", "shield", "earring", "ring1", "ring2", "ring3", "ring4",
+         "pendant", "belt", "medal"]
+
+
+@dataclass
+class StubConfig:
+    """Shape of the synthetic data served by StubMSUServer"""
+    worlds: List[str] = field(default_factory=lambda: ["Scania", "Bera", "Luna", "Elysium"])
+    rows_per_world: int = 10000
+    max_page_size: int = 100
+    equipment_per_character: int = len(SLOTS)
+    latency: float = 0.0
+    search_results: int = 50
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 overflows when a pooled client opens
+    # many connections at once, and every dropped SYN costs a 1 s retransmit
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubMSUServer:
+    """
+    Threaded HTTP server answering like the MSU API
+
+    Usable as a context manager; base_url points at the running server.
+    """
+
+    def __init__(self, config: StubConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._httpd = _StubHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubMSUServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _count(self):
+        with self._lock:
+            self.request_count += 1
+
+    # Synthetic data
+
+    def ranking_row(self, world: str, rank: int) -> Dict:
+        return {
+            "rank": rank,
+            "name": f"{world[:3]}Player{rank}",
+            "level": max(200, 300 - rank // 500),
+            "job": JOBS[rank % len(JOBS)],
+            "guild": GUILDS[rank % len(GUILDS)],
+            "fame": max(0, 50000 - rank),
+            "exp": max(0, 10 ** 12 - rank * 7919),
+            "world": world,
+            "avatar_url": f"https://example.invalid/avatars/{world}/{rank}.png",
+        }
+
+    def rankings(self, params: Dict[str, str]) -> Dict:
+        world = params.get("world") or self.config.worlds[0]
+        limit = min(int(params.get("limit", 100)), self.config.max_page_size)
+        page = int(params.get("page", 1))
+        start = (page - 1) * limit + 1
+        end = min(self.config.rows_per_world, start + limit - 1)
+        return {"rankings": [self.ranking_row(world, rank) for rank in range(start, end + 1)]}
+
+    def character(self, name: str) -> Dict:
+        digits = "".join(ch for ch in name if ch.isdigit())
+        rank = int(digits) if digits else 1
+        data = self.ranking_row(self.config.worlds[0], rank)
+        data["name"] = name
+        data["equipment"] = [
+            {
+                "slot": slot,
+                "name": f"Arcane {slot.title()}",
+                "item_id": 1000000 + index,
+                "level": 200,
+                "stars": 22,
+                "potential": "Legendary",
+                "stats": {"str": 40, "dex": 40, "att": 3},
+                "image_url": f"https://example.invalid/items/{1000000 + index}.png",
+            }
+            for index, slot in enumerate(SLOTS[:self.config.equipment_per_character])
+        ]
+        return data
+
+    def search(self, params: Dict[str, str]) -> Dict:
+        query = params.get("q", "")
+        world = params.get("world") or self.config.worlds[0]
+        limit = min(int(params.get("limit", 50)), self.config.search_results)
+        characters = []
+        for rank in range(1, self.config.rows_per_world + 1):
+            row = self.ranking_row(world, rank)
+            if query.lower() in row["name"].lower():
+                characters.append(row)
+                if len(characters) >= limit:
+                    break
+        return {"characters": characters}
+
+    def worlds(self) -> Dict:
+        return {"worlds": [{"name": world} for world in self.config.worlds]}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment; otherwise Nagle plus
+            # delayed ACKs add ~40 ms to every keep-alive response
+            disable_nagle_algorithm = True
+            wbufsize = 64 * 1024
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._count()
+                if server.config.latency:
+                    time.sleep(server.config.latency)
+
+                url = urlsplit(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                path = url.path
+                if path == "/v1/characters/rankings":
+                    body = server.rankings(params)
+                elif path == "/v1/characters/search":
+                    body = server.search(params)
+                elif path == "/v1/worlds":
+                    body = server.worlds()
+                elif path.startswith("/v1/characters/"):
+                    body = server.character(unquote(path[len("/v1/characters/"):]))
+                else:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                data = json.dumps(body).encode("utf-8")
+                etag = '"' + hashlib.md5(data).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Maple Story Universe API Test - command line exporter
+
+Headless entry point for exporting rankings, character details and search
+results to JSONL or CSV. Does not import Qt, so it runs from cron on
+servers without a display.
+
+Usage:
+    python cli.py rankings --world Scania Bera --max-rows 5000 -o rankings.jsonl
+    python cli.py details --names-file names.txt --workers 16 -o details.csv
+    python cli.py search Hero --world Scania
+    python cli.py leaderboard --limit 1000 -o leaderboard.csv
+    python cli.py rankings --world Scania -o rankings.jsonl --resume
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, TextIO
+
+from api.api_client import MSUApiClient, RequestScheduler, PRIORITY_BACKGROUND
+from api.crawl import iter_global_leaderboard
+from models.character import Character
+
+
+# Columns written for each record type in CSV output
+RANKING_FIELDS = ["world", "rank", "name", "level", "job", "guild", "popularity", "exp", "avatar_url"]
+DETAIL_FIELDS = RANKING_FIELDS + ["equipment"]
+LEADERBOARD_FIELDS = ["global_rank"] + RANKING_FIELDS
+
+
+def load_settings(args) -> Dict[str, Optional[str]]:
+    """API key and base URL from arguments, environment or config.py"""
+    api_key = args.api_key or os.getenv('MSU_API_KEY')
+    base_url = args.base_url or os.getenv('MSU_BASE_URL')
+    if not api_key:
+        try:
+            import config
+            api_key = getattr(config, 'MSU_API_KEY', None)
+            base_url = base_url or getattr(config, 'MSU_BASE_URL', None)
+        except ImportError:
+            pass
+    if api_key == "your_msu_api_key_here":
+        api_key = None
+    return {"api_key": api_key, "base_url": base_url}
+
+
+def character_record(char: Character, world: str = None, details: bool = False) -> Dict:
+    """Flat dictionary written for a character"""
+    record = char.to_dict()
+    if record.get("world") is None:
+        record["world"] = world
+    if details:
+        record["equipment"] = {slot: item.to_dict()
+                               for slot, item in (char.equipment or {}).items()}
+    return record
+
+
+class JsonlWriter:
+    """Writes one JSON object per line"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, record: Dict):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class CsvWriter:
+    """Writes records as CSV rows; nested values are stored as JSON"""
+
+    def __init__(self, stream: TextIO, fields: List[str], write_header: bool = True):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=fields, extrasaction="ignore")
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, record: Dict):
+        self.writer.writerow({key: json.dumps(value, ensure_ascii=False)
+                              if isinstance(value, (dict, list)) else value
+                              for key, value in record.items()})
+
+
+class Output:
+    """
+    Streaming output file with resume support
+
+    With resume, records already in the file are read back (a partial last
+    line left by an interrupted run is cut off) and new records are
+    appended. Otherwise the file is overwritten.
+    """
+
+    # Records written between flushes
+    FLUSH_EVERY = 100
+
+    def __init__(self, path: str, fmt: str, fields: List[str], resume: bool = False):
+        self.path = path
+        self.fmt = fmt
+        self.existing: List[Dict] = []
+        self._pending = 0
+
+        if path == "-":
+            self.stream = sys.stdout
+            self._close = False
+        else:
+            if resume and os.path.exists(path):
+                self.existing = self._read_existing()
+            self.stream = open(path, "a" if self.existing else "w", encoding="utf-8", newline="")
+            self._close = True
+
+        if fmt == "csv":
+            self.writer = CsvWriter(self.stream, fields, write_header=not self.existing)
+        else:
+            self.writer = JsonlWriter(self.stream)
+
+    def _read_existing(self) -> List[Dict]:
+        with open(self.path, "rb") as f:
+            data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            # Drop the line an interrupted run was in the middle of writing
+            with open(self.path, "r+b") as f:
+                f.truncate(len(complete))
+        text = complete.decode("utf-8")
+        if self.fmt == "csv":
+            return list(csv.DictReader(text.splitlines()))
+        records = []
+        for line in text.splitlines():
+            if line.strip():
+                records.append(json.loads(line))
+        return records
+
+    def write(self, record: Dict):
+        self.writer.write(record)
+        self._pending += 1
+        if self._pending >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        self.stream.flush()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        if self._close:
+            self.stream.close()
+
+
+class Progress:
+    """Rate-limited progress line on stderr"""
+
+    def __init__(self, label: str, total: int = None, quiet: bool = False, interval: float = 1.0):
+        self.label = label
+        self.total = total
+        self.quiet = quiet
+        self.interval = interval
+        self.count = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self._shown = 0.0
+        self._tty = sys.stderr.isatty()
+
+    def update(self, count: int = 1, errors: int = 0):
+        self.count += count
+        self.errors += errors
+        now = time.monotonic()
+        if now - self._shown >= self.interval:
+            self._shown = now
+            self._show(final=False)
+
+    def done(self):
+        self._show(final=True)
+
+    def _show(self, final: bool):
+        if self.quiet:
+            return
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        total = f"/{self.total}" if self.total else ""
+        errors = f", {self.errors} errors" if self.errors else ""
+        line = f"{self.label}: {self.count}{total} ({self.count / elapsed:.0f}/s{errors})"
+        if self._tty:
+            sys.stderr.write("\r" + line + ("\n" if final else ""))
+        else:
+            sys.stderr.write(line + "\n")
+        sys.stderr.flush()
+
+
+def output_format(args) -> str:
+    if args.format:
+        return args.format
+    return "csv" if args.output.lower().endswith(".csv") else "jsonl"
+
+
+def export_rankings(client: MSUApiClient, args) -> int:
+    fmt = output_format(args)
+    out = Output(args.output, fmt, RANKING_FIELDS, resume=args.resume)
+    # Rows already exported per requested world, so an interrupted run picks
+    # up after them
+    worlds = args.world or [None]
+    done: Dict[Optional[str], int] = dict.fromkeys(worlds, 0)
+    if args.world:
+        # Rows carry the world the API named; match it to the requested one
+        requested = {world.casefold(): world for world in args.world}
+        for record in out.existing:
+            world = requested.get((record.get("world") or "").casefold())
+            if world is not None:
+                done[world] += 1
+    else:
+        # Every row came from the single overall walk, whatever world it names
+        done[None] = len(out.existing)
+
+    try:
+        for world in worlds:
+            skip = done[world]
+            max_rows = None
+            if args.max_rows is not None:
+                max_rows = args.max_rows - skip
+                if max_rows <= 0:
+                    continue
+            progress = Progress(f"rankings {world or 'all worlds'}", args.max_rows, args.quiet)
+            progress.count = skip
+            for char in client.iter_rankings(world=world, page_size=args.page_size,
+                                             max_rows=max_rows, ranking_type=args.type,
+                                             start_row=skip):
+                out.write(character_record(char, world))
+                progress.update()
+            progress.done()
+    finally:
+        out.close()
+    return 0
+
+
+def export_leaderboard(client: MSUApiClient, args) -> int:
+    fmt = output_format(args)
+    out = Output(args.output, fmt, LEADERBOARD_FIELDS)
+    progress = Progress("leaderboard", args.limit, args.quiet)
+    try:
+        for global_rank, char in iter_global_leaderboard(client, args.world, limit=args.limit,
+                                                         page_size=args.page_size,
+                                                         ranking_type=args.type):
+            out.write({"global_rank": global_rank, **character_record(char)})
+            progress.update()
+        progress.done()
+    finally:
+        out.close()
+    return 0
+
+
+def read_names(args) -> List[str]:
+    names = list(args.names)
+    if args.names_file:
+        stream = sys.stdin if args.names_file == "-" else open(args.names_file, encoding="utf-8")
+        with stream:
+            names.extend(line.strip() for line in stream if line.strip())
+    return names
+
+
+def export_details(client: MSUApiClient, args) -> int:
+    fmt = output_format(args)
+    out = Output(args.output, fmt, DETAIL_FIELDS, resume=args.resume)
+    exported = {record.get("name", "").casefold() for record in out.existing}
+    names = [name for name in read_names(args) if name.casefold() not in exported]
+
+    progress = Progress("details", len(names), args.quiet)
+    try:
+        for result in client.get_characters_bulk(names, world=args.world,
+                                                  max_workers=args.workers,
+                                                  priority=PRIORITY_BACKGROUND):
+            if result.ok:
+                out.write(character_record(result.character, args.world, details=True))
+                progress.update()
+            else:
+                print(f"{result.name}: {result.error}", file=sys.stderr)
+                progress.update(errors=1)
+        progress.done()
+    finally:
+        out.close()
+    return 1 if progress.errors else 0
+
+
+def export_search(client: MSUApiClient, args) -> int:
+    fmt = output_format(args)
+    out = Output(args.output, fmt, RANKING_FIELDS)
+    progress = Progress(f"search '{args.query}'", quiet=args.quiet)
+    try:
+        for world in args.world or [None]:
+            for char in client.iter_search_characters(args.query, world):
+                out.write(character_record(char, world))
+                progress.update()
+        progress.done()
+    finally:
+        out.close()
+    return 0
+
+
+def export_worlds(client: MSUApiClient, args) -> int:
+    worlds = client.get_worlds()
+    for world in worlds:
+        print(world)
+    return 0 if worlds else 1
+
+
+def parse_args(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Export MapleStory Universe data without the GUI")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--api-key", help="MSU API key (default: MSU_API_KEY or config.py)")
+    common.add_argument("--base-url", help="MSU API base URL (default: MSU_BASE_URL or config.py)")
+    common.add_argument("--rate", type=float, default=10.0, help="Maximum requests per second")
+    common.add_argument("--quiet", action="store_true", help="Do not print progress to stderr")
+    common.add_argument("--metrics", metavar="FILE",
+                        help="Write request metrics in Prometheus text format to FILE when done")
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    output.add_argument("--format", choices=["jsonl", "csv"],
+                        help="Output format (default: from the file extension, else jsonl)")
+
+    resumable = argparse.ArgumentParser(add_help=False)
+    resumable.add_argument("--resume", action="store_true",
+                           help="Append to an existing output file, skipping what it already holds")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rankings = commands.add_parser("rankings", parents=[common, output, resumable],
+                                   help="Export rankings for one or more worlds")
+    rankings.add_argument("--world", nargs="+", help="Worlds to export (default: overall ranking)")
+    rankings.add_argument("--max-rows", type=int, help="Rows per world")
+    rankings.add_argument("--page-size", type=int, default=MSUApiClient.MAX_PAGE_SIZE)
+    rankings.add_argument("--type", default="overall", help="Ranking type (overall, level, fame, ...)")
+    rankings.set_defaults(func=export_rankings)
+
+    leaderboard = commands.add_parser("leaderboard", parents=[common, output],
+                                      help="Merge every world's rankings into one leaderboard")
+    leaderboard.add_argument("--world", nargs="+", help="Worlds to include (default: all)")
+    leaderboard.add_argument("--limit", type=int, default=100, help="Leaderboard rows to export")
+    leaderboard.add_argument("--page-size", type=int, default=MSUApiClient.MAX_PAGE_SIZE)
+    leaderboard.add_argument("--type", default="overall", help="Ranking type (overall, level, fame, ...)")
+    leaderboard.set_defaults(func=export_leaderboard)
+
+    details = commands.add_parser("details", parents=[common, output, resumable],
+                                  help="Export character details including equipment")
+    details.add_argument("names", nargs="*", help="Character names")
+    details.add_argument("--names-file", help="File with one name per line ('-' for stdin)")
+    details.add_argument("--world", help="World the characters are in")
+    details.add_argument("--workers", type=int, default=8, help="Concurrent lookups")
+    details.set_defaults(func=export_details)
+
+    search = commands.add_parser("search", parents=[common, output], help="Export search results")
+    search.add_argument("query", help="Name to search for")
+    search.add_argument("--world", nargs="+", help="Worlds to search (default: all)")
+    search.set_defaults(func=export_search)
+
+    worlds = commands.add_parser("worlds", parents=[common], help="List available worlds")
+    worlds.set_defaults(func=export_worlds)
+
+    return parser.parse_args(argv)
+
+
+def write_metrics(client: MSUApiClient, args):
+    """Dump request metrics to --metrics and summarise them on stderr"""
+    if not args.quiet:
+        print(f"API: {client.metrics.summary()}", file=sys.stderr)
+    if not args.metrics:
+        return
+    try:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(client.metrics.to_prometheus())
+    except OSError as e:
+        print(f"Could not write metrics to {args.metrics}: {str(e)}", file=sys.stderr)
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the exporter; returns the process exit code"""
+    args = parse_args(argv)
+    settings = load_settings(args)
+    if not settings["api_key"]:
+        print("No MSU API key: pass --api-key, set MSU_API_KEY or create config.py",
+              file=sys.stderr)
+        return 2
+
+    client = MSUApiClient(api_key=settings["api_key"], base_url=settings["base_url"],
+                          max_workers=getattr(args, "workers", 8),
+                          scheduler=RequestScheduler(rate=args.rate, burst=max(1, int(args.rate))))
+    try:
+        return args.func(client, args)
+    except KeyboardInterrupt:
+        print("\nInterrupted; rerun with --resume to continue", file=sys.stderr)
+        return 130
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        write_metrics(client, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
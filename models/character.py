@@ -2,11 +2,17 @@
 Character data model
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Optional, Dict
 
 
-@dataclass
+def intern_optional(value: Optional[str]) -> Optional[str]:
+    """Intern a repeated string value so all rows share one copy"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class Character:
     """Model representing a MapleStory character"""
     rank: int
@@ -20,6 +26,12 @@ class Character:
     exp: int = 0
     equipment: Optional[Dict] = None
     
+    def __post_init__(self):
+        # Job, guild and world repeat across thousands of rows
+        self.job = intern_optional(self.job)
+        self.guild = intern_optional(self.guild)
+        self.world = intern_optional(self.world)
+    
     def __str__(self):
         return f"{self.name} (Lv.{self.level} {self.job})"
     
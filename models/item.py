@@ -3,21 +3,32 @@ Item data model
 """
 
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional, Mapping
+from models.character import intern_optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Item:
-    """Model representing a MapleStory item"""
+    """
+    Model representing a MapleStory item
+    
+    Items are shared between characters wearing the same gear (see
+    models.item_catalog), so they are frozen and stats is read-only.
+    """
     name: str
     slot: str
     level: int = 0
     image_url: Optional[str] = None
     item_id: Optional[int] = None
-    stats: Optional[Dict] = None
+    stats: Optional[Mapping] = None
     potential: Optional[str] = None
     stars: int = 0
     
+    def __post_init__(self):
+        # Slot and potential names come from a small fixed vocabulary
+        object.__setattr__(self, 'slot', intern_optional(self.slot))
+        object.__setattr__(self, 'potential', intern_optional(self.potential))
+    
     def __str__(self):
         return f"{self.name} ({self.slot})"
     
@@ -29,7 +40,7 @@ class Item:
             "level": self.level,
             "image_url": self.image_url,
             "item_id": self.item_id,
-            "stats": self.stats,
+            "stats": dict(self.stats) if isinstance(self.stats, Mapping) else self.stats,
             "potential": self.potential,
             "stars": self.stars
         } 
\ No newline at end of file
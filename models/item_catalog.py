@@ -0,0 +1,126 @@
+"""
+Catalog of distinct items shared by every parsed character
+"""
+
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Hashable, Mapping, Optional
+
+from models.character import intern_optional
+from models.item import Item
+
+
+class ItemCatalog:
+    """
+    Keeps one copy of each distinct item seen in character payloads
+
+    Top-ranked characters largely wear the same gear, so a slot holding the
+    same item (same item_id, name, level, icon, stars, potential and stats)
+    on two characters gets the same Item object, and identical stat blocks
+    are stored once. Items are frozen and their stats are read-only
+    mappings, so sharing them between characters is safe. An item whose
+    payload differs from what was seen before (e.g. a renamed item or a new
+    icon URL) simply becomes a new variant. Items without an item_id, or
+    with stats that cannot be compared, are built per entry.
+
+    At most max_variants items and max_variants stat blocks are kept; the
+    least recently used ones are dropped first.
+    """
+
+    def __init__(self, max_variants: int = 10000):
+        self.max_variants = max_variants
+        self._lock = threading.Lock()
+        self._stats: "OrderedDict[Hashable, Mapping]" = OrderedDict()
+        self._variants: "OrderedDict[Hashable, Item]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._variants)
+
+    def item(self, item_data: Dict, slot: str) -> Item:
+        """The Item for one equipment entry, reusing a known variant if there is one"""
+        item_id = item_data.get('item_id')
+        stats = item_data.get('stats') or None
+        stats_key = _stats_key(stats)
+        if item_id is None or (stats is not None and stats_key is None):
+            return _build_item(item_data, slot)
+
+        name = item_data.get('name', 'Unknown')
+        level = item_data.get('level', 0)
+        image_url = item_data.get('image_url')
+        stars = item_data.get('stars') or 0
+        potential = item_data.get('potential')
+        key = (item_id, slot, name, level, image_url, stars, potential, stats_key)
+
+        with self._lock:
+            item = self._variants.get(key)
+            if item is not None:
+                self._variants.move_to_end(key)
+                self.hits += 1
+                return item
+            self.misses += 1
+
+            if stats_key is not None:
+                shared = self._stats.get(stats_key)
+                if shared is None:
+                    shared = self._stats[stats_key] = MappingProxyType(dict(stats))
+                    if len(self._stats) > self.max_variants:
+                        self._stats.popitem(last=False)
+                else:
+                    self._stats.move_to_end(stats_key)
+                stats = shared
+
+            item = Item(name=intern_optional(name), slot=slot, level=level,
+                        image_url=intern_optional(image_url), item_id=item_id,
+                        stats=stats, potential=potential, stars=stars)
+            self._variants[key] = item
+            if len(self._variants) > self.max_variants:
+                self._variants.popitem(last=False)
+            return item
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+            self._variants.clear()
+
+
+def _build_item(item_data: Dict, slot: str) -> Item:
+    stats = item_data.get('stats') or None
+    return Item(
+        name=item_data.get('name', 'Unknown'),
+        slot=slot,
+        level=item_data.get('level', 0),
+        image_url=item_data.get('image_url'),
+        item_id=item_data.get('item_id'),
+        # Read-only like the catalog's, so every Item behaves the same
+        stats=MappingProxyType(dict(stats)) if isinstance(stats, dict) else stats,
+        potential=item_data.get('potential'),
+        stars=item_data.get('stars') or 0
+    )
+
+
+def _stats_key(stats: Optional[Dict]) -> Optional[Hashable]:
+    """Hashable form of a flat stat block, or None if it cannot be shared"""
+    if not isinstance(stats, dict):
+        return None
+    try:
+        key = tuple(sorted(stats.items()))
+        hash(key)
+    except TypeError:
+        # Nested or unorderable values
+        return None
+    return key
+
+
+# Shared catalog for the application session
+_item_catalog: Optional[ItemCatalog] = None
+
+
+def get_item_catalog() -> ItemCatalog:
+    """Shared ItemCatalog for the application session"""
+    global _item_catalog
+    if _item_catalog is None:
+        _item_catalog = ItemCatalog()
+    return _item_catalog
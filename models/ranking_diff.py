@@ -0,0 +1,87 @@
+"""
+Differences between two ranking refreshes
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.character import Character
+
+
+# Fields compared between refreshes; rank changes are reported as moves
+DIFF_FIELDS = ("name", "level", "job", "guild", "popularity", "exp", "avatar_url", "equipment")
+
+RankingKey = Tuple[str, Optional[str]]
+
+
+def ranking_key(char: Character) -> RankingKey:
+    """Identity of a character across refreshes: case-folded name and world"""
+    return char.name.casefold(), char.world
+
+
+@dataclass
+class RankingDiff:
+    """
+    What changed between an old and a new ranking
+
+    moved and changed hold (old, new) character pairs; a character can be in
+    both when its rank and other fields changed together.
+    """
+    inserted: List[Character] = field(default_factory=list)
+    removed: List[Character] = field(default_factory=list)
+    moved: List[Tuple[Character, Character]] = field(default_factory=list)
+    changed: List[Tuple[Character, Character, Tuple[str, ...]]] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.inserted or self.removed or self.moved or self.changed)
+
+    def replacements(self) -> Dict[int, Character]:
+        """New character for every old one that moved or changed, keyed by id(old)"""
+        replacements = {id(old): new for old, new in self.moved}
+        replacements.update((id(old), new) for old, new, _ in self.changed)
+        return replacements
+
+    def rank_changes(self) -> Dict[RankingKey, Optional[int]]:
+        """Places gained (positive) or lost per key; None for new entries"""
+        changes: Dict[RankingKey, Optional[int]] = {
+            ranking_key(new): old.rank - new.rank for old, new in self.moved
+        }
+        changes.update((ranking_key(char), None) for char in self.inserted)
+        return changes
+
+    def summary(self) -> str:
+        parts = [f"{len(items)} {label}" for items, label in (
+            (self.moved, "moved"), (self.changed, "changed"),
+            (self.inserted, "new"), (self.removed, "removed")) if items]
+        return ", ".join(parts) if parts else "no changes"
+
+
+def diff_rankings(old: Sequence[Character], new: Sequence[Character]) -> RankingDiff:
+    """
+    Compare two rankings keyed by name and world
+
+    Characters are matched with ranking_key(); if a key appears twice in a
+    list, the later old entry is matched and later new entries count as inserts.
+    """
+    # Keys are built inline; this runs over every row of both lists
+    old_by_key = {(char.name.casefold(), char.world): char for char in old}
+    diff = RankingDiff()
+
+    for char in new:
+        previous = old_by_key.pop((char.name.casefold(), char.world), None)
+        if previous is None:
+            diff.inserted.append(char)
+            continue
+        if previous.rank != char.rank:
+            diff.moved.append((previous, char))
+        elif previous == char:
+            # Most rows are unchanged; one dataclass comparison settles it
+            continue
+        fields = tuple(name for name in DIFF_FIELDS
+                       if getattr(previous, name) != getattr(char, name))
+        if fields:
+            diff.changed.append((previous, char, fields))
+
+    diff.removed = list(old_by_key.values())
+    return diff
@@ -0,0 +1,324 @@
+"""
+Columnar storage for large ranking snapshots
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models.character import Character
+
+
+class DictionaryColumn:
+    """
+    String column stored as small integer codes into a table of distinct values
+
+    Code 0 is reserved for None.
+    """
+
+    def __init__(self, values: List[Optional[str]] = None, codes=None):
+        self.values: List[Optional[str]] = values if values is not None else [None]
+        self.codes = codes if codes is not None else array("I")
+        self._lookup: Dict[Optional[str], int] = {value: code for code, value in enumerate(self.values)}
+
+    def append(self, value: Optional[str]):
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(sys.intern(value))
+            self._lookup[value] = code
+        self.codes.append(code)
+
+    def extend(self, values: Iterable[Optional[str]]):
+        for value in values:
+            self.append(value)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.codes) * self.codes.itemsize + sum(sys.getsizeof(v) for v in self.values)
+
+
+class BlobColumn:
+    """
+    Column of mostly-unique strings packed into one UTF-8 buffer with offsets
+
+    A None value is stored as an empty slice and flagged in the null mask.
+    """
+
+    def __init__(self, data=None, offsets=None, nulls=None):
+        self.data = data if data is not None else bytearray()
+        self.offsets = offsets if offsets is not None else array("Q", [0])
+        self.nulls = nulls if nulls is not None else bytearray()
+
+    def append(self, value: Optional[str]):
+        if value is None:
+            self.nulls.append(1)
+        else:
+            self.nulls.append(0)
+            self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def extend(self, values: Iterable[Optional[str]]):
+        for value in values:
+            self.append(value)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        if self.nulls[row]:
+            return None
+        return bytes(self.data[self.offsets[row]:self.offsets[row + 1]]).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.nulls)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + len(self.offsets) * self.offsets.itemsize + len(self.nulls)
+
+
+class RankingSnapshot:
+    """
+    Column-oriented container for ranking rows
+
+    Numeric fields live in typed arrays, repeated strings (job, guild, world)
+    are dictionary-encoded and names/avatar URLs are packed into UTF-8
+    buffers. Rows are handed out as Character objects built on access, so a
+    snapshot of millions of rows costs a few dozen bytes per row instead of
+    a full Character object each. Equipment is not stored.
+    """
+
+    NUMERIC_COLUMNS = {
+        "rank": "q",
+        "level": "i",
+        "popularity": "q",
+        "exp": "q",
+    }
+    DICTIONARY_COLUMNS = ("job", "guild", "world")
+    BLOB_COLUMNS = ("name", "avatar_url")
+
+    # Rows converted per pass in extend()
+    CHUNK_SIZE = 10000
+
+    # Snapshot file layout: magic, header length, JSON header, then the
+    # column buffers, each starting on an 8-byte boundary
+    FILE_MAGIC = b"MSUSNAP1"
+    FILE_VERSION = 1
+    _ALIGN = 8
+
+    def __init__(self):
+        self.numeric = {name: array(typecode) for name, typecode in self.NUMERIC_COLUMNS.items()}
+        self.dictionary = {name: DictionaryColumn() for name in self.DICTIONARY_COLUMNS}
+        self.blob = {name: BlobColumn() for name in self.BLOB_COLUMNS}
+        # Time the snapshot was written, for snapshots read from a file
+        self.saved_at: Optional[float] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._views: List[memoryview] = []
+
+    @classmethod
+    def from_characters(cls, characters: Iterable[Character]) -> "RankingSnapshot":
+        snapshot = cls()
+        snapshot.extend(characters)
+        return snapshot
+
+    def append(self, char: Character):
+        for name, column in self.numeric.items():
+            column.append(getattr(char, name) or 0)
+        for name, column in self.dictionary.items():
+            column.append(getattr(char, name))
+        for name, column in self.blob.items():
+            column.append(getattr(char, name))
+
+    def extend(self, characters: Iterable[Character]):
+        # Fill column by column in chunks; much faster than append() per row
+        iterator = iter(characters)
+        while True:
+            chunk = list(islice(iterator, self.CHUNK_SIZE))
+            if not chunk:
+                break
+            for name, column in self.numeric.items():
+                column.extend([getattr(char, name) or 0 for char in chunk])
+            for name, column in self.dictionary.items():
+                column.extend([getattr(char, name) for char in chunk])
+            for name, column in self.blob.items():
+                column.extend([getattr(char, name) for char in chunk])
+
+    def __len__(self) -> int:
+        return len(self.numeric["rank"])
+
+    def __getitem__(self, row: int) -> Character:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("snapshot row out of range")
+        numeric, dictionary, blob = self.numeric, self.dictionary, self.blob
+        return Character(
+            rank=numeric["rank"][row],
+            name=blob["name"][row],
+            level=numeric["level"][row],
+            job=dictionary["job"][row],
+            guild=dictionary["guild"][row],
+            popularity=numeric["popularity"][row],
+            avatar_url=blob["avatar_url"][row],
+            world=dictionary["world"][row],
+            exp=numeric["exp"][row],
+        )
+
+    def __iter__(self) -> Iterator[Character]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def to_characters(self) -> List[Character]:
+        return list(self)
+
+    def column(self, name: str):
+        """Raw column by field name (typed array or encoded string column)"""
+        for columns in (self.numeric, self.dictionary, self.blob):
+            if name in columns:
+                return columns[name]
+        raise KeyError(name)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns"""
+        total = sum(len(column) * column.itemsize for column in self.numeric.values())
+        total += sum(column.nbytes for column in self.dictionary.values())
+        total += sum(column.nbytes for column in self.blob.values())
+        return total
+
+    def _buffers(self):
+        """(column, part, typecode, buffer) for every buffer written to a file"""
+        for name, column in self.numeric.items():
+            yield name, "values", self.NUMERIC_COLUMNS[name], column
+        for name, column in self.dictionary.items():
+            yield name, "codes", "I", column.codes
+        for name, column in self.blob.items():
+            yield name, "data", "B", column.data
+            yield name, "offsets", "Q", column.offsets
+            yield name, "nulls", "B", column.nulls
+
+    def save(self, path: str):
+        """
+        Write the snapshot to a file that load() can memory-map
+
+        The file is replaced atomically, so a reader never sees a partial write.
+        """
+        buffers = []
+        offset = 0
+        for column, part, typecode, buffer in self._buffers():
+            length = memoryview(buffer).nbytes
+            buffers.append({"column": column, "part": part, "typecode": typecode,
+                            "offset": offset, "length": length})
+            offset += -(-length // self._ALIGN) * self._ALIGN
+        header = json.dumps({
+            "version": self.FILE_VERSION,
+            "byteorder": sys.byteorder,
+            "rows": len(self),
+            "saved_at": time.time(),
+            "dictionaries": {name: column.values[1:] for name, column in self.dictionary.items()},
+            "buffers": buffers,
+        }).encode("utf-8")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.FILE_MAGIC + struct.pack("<I", len(header)) + header)
+                f.write(b"\0" * (-f.tell() % self._ALIGN))
+                for _, _, _, buffer in self._buffers():
+                    f.write(buffer)
+                    f.write(b"\0" * (-f.tell() % self._ALIGN))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "RankingSnapshot":
+        """
+        Open a snapshot written by save()
+
+        Columns are views straight into a read-only memory map of the file,
+        so opening is constant-time and rows are only paged in when read.
+        The result cannot be appended to; call close() to release the file.
+
+        Raises:
+            ValueError: The file is not a snapshot this version can read
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        snapshot = cls()
+        snapshot._mmap = data
+        try:
+            magic_size = len(cls.FILE_MAGIC)
+            if data[:magic_size] != cls.FILE_MAGIC:
+                raise ValueError(f"{path} is not a ranking snapshot")
+            (header_size,) = struct.unpack_from("<I", data, magic_size)
+            header_start = magic_size + 4
+            header = json.loads(data[header_start:header_start + header_size].decode("utf-8"))
+            if header.get("version") != cls.FILE_VERSION or header.get("byteorder") != sys.byteorder:
+                raise ValueError(f"{path} was written by an incompatible version")
+
+            body_start = header_start + header_size
+            body_start += -body_start % cls._ALIGN
+            whole = memoryview(data)
+            snapshot._views.append(whole)
+            parts = {}
+            for entry in header["buffers"]:
+                start = body_start + entry["offset"]
+                if start + entry["length"] > len(whole):
+                    raise ValueError(f"{path} is truncated")
+                view = whole[start:start + entry["length"]].cast(entry["typecode"])
+                snapshot._views.append(view)
+                parts[entry["column"], entry["part"]] = view
+
+            for name in cls.NUMERIC_COLUMNS:
+                snapshot.numeric[name] = parts[name, "values"]
+            for name in cls.DICTIONARY_COLUMNS:
+                values = [None] + [sys.intern(value) for value in header["dictionaries"][name]]
+                snapshot.dictionary[name] = DictionaryColumn(values, parts[name, "codes"])
+            for name in cls.BLOB_COLUMNS:
+                snapshot.blob[name] = BlobColumn(parts[name, "data"], parts[name, "offsets"],
+                                                 parts[name, "nulls"])
+            if any(len(column) != header["rows"] for column in snapshot.numeric.values()):
+                raise ValueError(f"{path} has inconsistent column lengths")
+            snapshot.saved_at = header.get("saved_at")
+        except (KeyError, TypeError, struct.error) as e:
+            snapshot.close()
+            raise ValueError(f"{path} is not a valid ranking snapshot: {e}") from e
+        except BaseException:
+            snapshot.close()
+            raise
+        return snapshot
+
+    def close(self):
+        """Release the memory map of a snapshot opened with load()"""
+        if self._mmap is None:
+            return
+        data, views = self._mmap, self._views
+        # Drop the columns first; they are views into the map
+        self.__init__()
+        for view in reversed(views):
+            view.release()
+        data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,121 @@
+"""
+In-memory search index over a list of characters
+"""
+
+import unicodedata
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+from models.character import Character
+
+
+def normalize_key(text: Optional[str]) -> str:
+    """
+    Normalize text for case-insensitive matching
+
+    NFKD folds compatibility forms (full-width letters, compatibility jamo)
+    and splits Hangul syllables into jamo, so a syllable that is still being
+    composed in an IME ("달ㅊ") already matches the finished name ("달치즈").
+    """
+    if not text:
+        return ""
+    return unicodedata.normalize("NFKD", text).casefold()
+
+
+class CharacterSearchIndex:
+    """
+    Substring search over character names, jobs and guilds
+
+    Names are indexed by character bigrams; candidates from the posting
+    lists are then checked against the full key (one-letter queries scan the
+    names directly). Jobs and guilds repeat across many rows, so each
+    distinct value is matched once and expanded to its rows.
+
+    Results are source row numbers in ascending order. When a query contains
+    the previous query (typically the user typing another letter), only the
+    previous results are rechecked.
+    """
+
+    def __init__(self, characters: Sequence[Character]):
+        self.size = len(characters)
+        self._names: List[str] = [normalize_key(char.name) for char in characters]
+        self._last_query = ""
+        self._last_rows: Optional[List[int]] = None
+
+        bigrams = defaultdict(list)
+        for row, name in enumerate(self._names):
+            for gram in set(map("".join, zip(name, name[1:]))):
+                bigrams[gram].append(row)
+
+        # Jobs and guilds are normalized once per distinct value
+        values = defaultdict(list)
+        for row, char in enumerate(characters):
+            if char.job:
+                values[char.job].append(row)
+            if char.guild:
+                values[char.guild].append(row)
+
+        # Posting lists are frozen into compact arrays once built
+        self._bigrams: Dict[str, array] = {gram: array("I", rows) for gram, rows in bigrams.items()}
+        self._values: Dict[str, array] = {}
+        for value, rows in values.items():
+            key = normalize_key(value)
+            if key in self._values:
+                rows = sorted(set(self._values[key]).union(rows))
+            self._values[key] = array("I", rows)
+
+    def search(self, query: str) -> Optional[List[int]]:
+        """Rows whose name, job or guild contains query; None for an empty query"""
+        key = normalize_key(query.strip())
+        if not key:
+            self._last_query, self._last_rows = "", None
+            return None
+
+        if self._last_rows is not None and self._last_query and self._last_query in key:
+            rows = self._refine(self._last_rows, key)
+        else:
+            rows = self._lookup(key)
+
+        self._last_query, self._last_rows = key, rows
+        return rows
+
+    def _lookup(self, key: str) -> List[int]:
+        matches = set(self._match_names(key))
+        for value, value_rows in self._values.items():
+            if key in value:
+                matches.update(value_rows)
+        return sorted(matches)
+
+    def _match_names(self, key: str) -> List[int]:
+        if len(key) == 1:
+            return [row for row, name in enumerate(self._names) if key in name]
+
+        postings = []
+        for gram in {key[i:i + 2] for i in range(len(key) - 1)}:
+            posting = self._bigrams.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        if len(key) == 2:
+            return list(candidates)
+        names = self._names
+        return [row for row in candidates if key in names[row]]
+
+    def _refine(self, rows: List[int], key: str) -> List[int]:
+        matching_values = [value_rows for value, value_rows in self._values.items() if key in value]
+        if not matching_values:
+            names = self._names
+            return [row for row in rows if key in names[row]]
+        value_matches = set()
+        for value_rows in matching_values:
+            value_matches.update(value_rows)
+        names = self._names
+        return [row for row in rows if row in value_matches or key in names[row]]
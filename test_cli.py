@@ -0,0 +1,56 @@
+"""
+Tests for the command line exporter against the local stub server
+"""
+
+import json
+
+import cli
+from benchmarks.stub_server import StubConfig, StubMSUServer
+
+
+def run_rankings(server, path, *extra):
+    return cli.main(["rankings", "--api-key", "test", "--base-url", server.base_url,
+                     "--rate", "1000", "--quiet", "--max-rows", "250", "-o", path, *extra])
+
+
+def read_names(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["name"] for line in f if line.strip()]
+
+
+def test_rankings_resume_without_world(tmp_path):
+    """--resume without --world continues after the rows already written"""
+    path = str(tmp_path / "rankings.jsonl")
+    with StubMSUServer(StubConfig(rows_per_world=1000)) as server:
+        assert run_rankings(server, path) == 0
+        expected = read_names(path)
+
+        # Cut the export short, leaving half a line like an interrupted run
+        with open(path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        with open(path, "wb") as f:
+            f.writelines(lines[:120])
+            f.write(lines[120][:10])
+
+        assert run_rankings(server, path, "--resume") == 0
+
+    assert read_names(path) == expected
+    assert len(expected) == 250
+
+
+def test_rankings_resume_with_worlds(tmp_path):
+    """--resume with several worlds skips each world's exported rows"""
+    path = str(tmp_path / "rankings.jsonl")
+    with StubMSUServer(StubConfig(rows_per_world=1000)) as server:
+        assert run_rankings(server, path, "--world", "Scania", "Bera") == 0
+        expected = read_names(path)
+
+        with open(path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        with open(path, "wb") as f:
+            f.writelines(lines[:300])
+
+        assert run_rankings(server, path, "--world", "Scania", "Bera", "--resume") == 0
+
+    assert read_names(path) == expected
+    assert len(expected) == 500
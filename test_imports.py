@@ -37,9 +37,51 @@ def test_imports():
         import models.item
         print(f"{check} models.item imported successfully")
         
+        import models.item_catalog
+        print(f"{check} models.item_catalog imported successfully")
+        
+        import models.search_index
+        print(f"{check} models.search_index imported successfully")
+        
+        import models.ranking_snapshot
+        print(f"{check} models.ranking_snapshot imported successfully")
+        
+        import models.ranking_diff
+        print(f"{check} models.ranking_diff imported successfully")
+        
         import api.api_client
         print(f"{check} api.api_client imported successfully")
         
+        import api.cache
+        print(f"{check} api.cache imported successfully")
+        
+        import api.parsing
+        print(f"{check} api.parsing imported successfully")
+        
+        import api.async_client
+        print(f"{check} api.async_client imported successfully")
+        
+        import api.streaming
+        print(f"{check} api.streaming imported successfully")
+        
+        import api.crawl
+        print(f"{check} api.crawl imported successfully")
+        
+        import api.paths
+        print(f"{check} api.paths imported successfully")
+        
+        import api.metrics
+        print(f"{check} api.metrics imported successfully")
+        
+        import api.singleflight
+        print(f"{check} api.singleflight imported successfully")
+        
+        import api.name_index
+        print(f"{check} api.name_index imported successfully")
+        
+        import cli
+        print(f"{check} cli imported successfully")
+        
         # Test UI imports (may fail in headless environment)
         try:
             import ui.main_window
@@ -47,6 +89,24 @@ def test_imports():
             
             import ui.character_widget
             print(f"{check} ui.character_widget imported successfully")
+            
+            import ui.image_loader
+            print(f"{check} ui.image_loader imported successfully")
+            
+            import ui.startup_profile
+            print(f"{check} ui.startup_profile imported successfully")
+            
+            import ui.detail_prefetcher
+            print(f"{check} ui.detail_prefetcher imported successfully")
+            
+            import ui.name_completer
+            print(f"{check} ui.name_completer imported successfully")
+            
+            import ui.character_table_model
+            print(f"{check} ui.character_table_model imported successfully")
+            
+            import ui.refresh_scheduler
+            print(f"{check} ui.refresh_scheduler imported successfully")
         except ImportError as e:
             print(f"{warn} UI imports failed (expected in headless environment): {e}")
             # This is okay in CI environment
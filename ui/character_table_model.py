@@ -0,0 +1,402 @@
+"""
+Model/view classes for the character table
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+
+from PyQt6.QtCore import (
+    Qt, QAbstractProxyModel, QAbstractTableModel, QModelIndex, pyqtSignal
+)
+from PyQt6.QtGui import QColor
+
+from models.character import Character
+from models.ranking_diff import RankingDiff, RankingKey, ranking_key
+
+
+# Role that returns the Character behind a row
+CharacterRole = Qt.ItemDataRole.UserRole
+
+
+class CharacterTableModel(QAbstractTableModel):
+    """
+    Table model backed directly by a list of characters
+
+    Nothing is allocated per row: cell text is produced in data() only when
+    the view asks for it, which is for the rows currently on screen.
+    """
+
+    # Emitted around apply_diff() so proxies can re-sort once per refresh
+    diff_about_to_be_applied = pyqtSignal()
+    diff_applied = pyqtSignal()
+
+    HEADERS = ["Rank", "Name", "Level", "Job"]
+
+    # Cell text per column
+    COLUMNS: List[Callable[[Character], str]] = [
+        lambda char: str(char.rank),
+        lambda char: char.name,
+        lambda char: str(char.level),
+        lambda char: char.job,
+    ]
+
+    # Columns whose full text is shown as a tooltip
+    TOOLTIP_COLUMNS = (1, 3)
+
+    RANK_COLUMN = 0
+    RANK_UP_COLOR = QColor(0, 150, 0)
+    RANK_DOWN_COLOR = QColor(200, 0, 0)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._characters: List[Character] = []
+        # Rank movement from the last apply_diff(), shown next to the rank
+        self._rank_changes: Dict[RankingKey, Optional[int]] = {}
+        self.show_rank_changes = False
+
+    @property
+    def characters(self) -> List[Character]:
+        return self._characters
+
+    def set_characters(self, characters: List[Character]):
+        """Replace the backing list (the list is used as-is, not copied)"""
+        self.beginResetModel()
+        self._characters = characters
+        self._rank_changes = {}
+        self.endResetModel()
+
+    def apply_diff(self, diff: RankingDiff):
+        """
+        Update the rows named in a diff instead of resetting the model
+
+        Changed characters are swapped in place and announced with dataChanged,
+        removed rows are taken out and new characters are appended at the end,
+        so views keep their selection and scroll position. Row order is not
+        rank order afterwards; sort through CharacterProxyModel.
+        
+        The diff must have been computed against this model's characters.
+        """
+        self.diff_about_to_be_applied.emit()
+        try:
+            self._apply_diff(diff)
+        finally:
+            self.diff_applied.emit()
+
+    def _apply_diff(self, diff: RankingDiff):
+        replacements = diff.replacements()
+        removed = {id(char) for char in diff.removed}
+        changed_rows, removed_rows = [], []
+        if replacements or removed:
+            for row, char in enumerate(self._characters):
+                new = replacements.get(id(char))
+                if new is not None:
+                    self._characters[row] = new
+                    changed_rows.append(row)
+                elif id(char) in removed:
+                    removed_rows.append(row)
+
+        last_column = self.columnCount() - 1
+        for first, last in _row_ranges(changed_rows):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_column))
+
+        # Remove from the bottom up so earlier row numbers stay valid
+        for first, last in reversed(_row_ranges(removed_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._characters[first:last + 1]
+            self.endRemoveRows()
+
+        if diff.inserted:
+            start = len(self._characters)
+            self.beginInsertRows(QModelIndex(), start, start + len(diff.inserted) - 1)
+            self._characters.extend(diff.inserted)
+            self.endInsertRows()
+
+        self._rank_changes = diff.rank_changes()
+        if self.show_rank_changes:
+            self._rank_column_changed()
+
+    def set_show_rank_changes(self, show: bool):
+        """Toggle the rank movement indicators in the rank column"""
+        self.show_rank_changes = show
+        self._rank_column_changed()
+
+    def rank_change_text(self, char: Character) -> str:
+        """Indicator for a character's movement in the last refresh"""
+        key = ranking_key(char)
+        if key not in self._rank_changes:
+            return ""
+        change = self._rank_changes[key]
+        if change is None:
+            return "NEW"
+        return f"\u25b2{change}" if change > 0 else f"\u25bc{-change}"
+
+    def _rank_column_changed(self):
+        if self._characters:
+            self.dataChanged.emit(self.index(0, self.RANK_COLUMN),
+                                  self.index(len(self._characters) - 1, self.RANK_COLUMN))
+
+    def character_at(self, row: int) -> Optional[Character]:
+        if 0 <= row < len(self._characters):
+            return self._characters[row]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._characters)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        char = self._characters[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            text = self.COLUMNS[index.column()](char)
+            if self.show_rank_changes and index.column() == self.RANK_COLUMN:
+                change = self.rank_change_text(char)
+                if change:
+                    text = f"{text} {change}"
+            return text
+        if (role == Qt.ItemDataRole.ForegroundRole and self.show_rank_changes
+                and index.column() == self.RANK_COLUMN):
+            change = self._rank_changes.get(ranking_key(char))
+            if change is not None:
+                return self.RANK_UP_COLOR if change > 0 else self.RANK_DOWN_COLOR
+            return None
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() in self.TOOLTIP_COLUMNS:
+            # Show full name/job on hover
+            return self.COLUMNS[index.column()](char)
+        if role == CharacterRole:
+            return char
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+
+class CharacterProxyModel(QAbstractProxyModel):
+    """
+    Sorting and filtering proxy for CharacterTableModel
+
+    Rows are kept as a plain list of source rows, so sorting uses Python's
+    sort with a key per column and filtering takes a precomputed set of
+    rows. Neither calls back into data() once per row, which keeps them fast
+    with very large tables.
+    """
+
+    # Sort key per column
+    SORT_KEYS: List[Callable[[Character], object]] = [
+        lambda char: char.rank,
+        lambda char: char.name.casefold(),
+        lambda char: char.level,
+        lambda char: char.job.casefold(),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._proxy_to_source: List[int] = []
+        self._source_to_proxy: List[int] = []
+        self._filter_rows: Optional[Sequence[int]] = None
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        # While the source applies a diff, re-sorting waits until it is done
+        self._in_diff = False
+        self._resort_pending = False
+
+    def setSourceModel(self, source_model):
+        old_model = self.sourceModel()
+        if old_model is not None:
+            old_model.modelReset.disconnect(self._on_source_reset)
+            old_model.dataChanged.disconnect(self._on_source_data_changed)
+            old_model.rowsAboutToBeRemoved.disconnect(self._on_source_rows_about_to_be_removed)
+            old_model.rowsRemoved.disconnect(self._on_source_rows_removed)
+            old_model.rowsInserted.disconnect(self._on_source_rows_inserted)
+            old_model.diff_about_to_be_applied.disconnect(self._on_diff_about_to_be_applied)
+            old_model.diff_applied.disconnect(self._on_diff_applied)
+        self.beginResetModel()
+        super().setSourceModel(source_model)
+        source_model.modelReset.connect(self._on_source_reset)
+        source_model.dataChanged.connect(self._on_source_data_changed)
+        source_model.rowsAboutToBeRemoved.connect(self._on_source_rows_about_to_be_removed)
+        source_model.rowsRemoved.connect(self._on_source_rows_removed)
+        source_model.rowsInserted.connect(self._on_source_rows_inserted)
+        source_model.diff_about_to_be_applied.connect(self._on_diff_about_to_be_applied)
+        source_model.diff_applied.connect(self._on_diff_applied)
+        self._rebuild()
+        self.endResetModel()
+
+    def set_filter_rows(self, rows: Optional[Sequence[int]]):
+        """Show only the given source rows; None shows every row"""
+        self.beginResetModel()
+        self._filter_rows = rows
+        self._rebuild()
+        self.endResetModel()
+
+    def source_row(self, proxy_row: int) -> int:
+        return self._proxy_to_source[proxy_row]
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self._resort()
+
+    def _resort(self):
+        """Rebuild the row order, keeping persistent indexes (selection) on their rows"""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        source_rows = [self._proxy_to_source[index.row()] for index in persistent]
+        self._rebuild()
+        self.changePersistentIndexList(persistent, [
+            self.index(self._source_to_proxy[row], index.column())
+            if self._source_to_proxy[row] >= 0 else QModelIndex()
+            for row, index in zip(source_rows, persistent)
+        ])
+        self.layoutChanged.emit()
+
+    def _resort_later(self):
+        """Re-sort now, or once the diff being applied is complete"""
+        if self._in_diff:
+            self._resort_pending = True
+        else:
+            self._resort()
+
+    def _rebuild(self):
+        source = self.sourceModel()
+        characters = source.characters if source is not None else []
+        if self._filter_rows is None:
+            rows = list(range(len(characters)))
+        else:
+            rows = [row for row in self._filter_rows if row < len(characters)]
+        if 0 <= self._sort_column < len(self.SORT_KEYS):
+            key = self.SORT_KEYS[self._sort_column]
+            keys = [key(char) for char in characters]
+            rows.sort(key=keys.__getitem__,
+                      reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+        self._proxy_to_source = rows
+        self._reindex()
+
+    def _reindex(self):
+        source = self.sourceModel()
+        self._source_to_proxy = [-1] * (len(source.characters) if source is not None else 0)
+        for proxy_row, source_row in enumerate(self._proxy_to_source):
+            self._source_to_proxy[source_row] = proxy_row
+
+    def _on_source_reset(self):
+        self.beginResetModel()
+        # A new character list invalidates row numbers from the old one
+        self._filter_rows = None
+        self._rebuild()
+        self.endResetModel()
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        if top_left.column() <= self._sort_column <= bottom_right.column():
+            # The sort key may have changed; re-sorting repaints the rows anyway
+            self._resort_later()
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            proxy_row = self._source_to_proxy[row]
+            if proxy_row >= 0:
+                self.dataChanged.emit(
+                    self.index(proxy_row, top_left.column()),
+                    self.index(proxy_row, bottom_right.column()),
+                    roles
+                )
+
+    def _on_source_rows_about_to_be_removed(self, parent, first, last):
+        proxy_rows = sorted(self._source_to_proxy[row] for row in range(first, last + 1)
+                            if self._source_to_proxy[row] >= 0)
+        for proxy_first, proxy_last in reversed(_row_ranges(proxy_rows)):
+            self.beginRemoveRows(QModelIndex(), proxy_first, proxy_last)
+            del self._proxy_to_source[proxy_first:proxy_last + 1]
+            self.endRemoveRows()
+
+    def _on_source_rows_removed(self, parent, first, last):
+        count = last - first + 1
+        self._proxy_to_source = [row - count if row > last else row
+                                 for row in self._proxy_to_source]
+        if self._filter_rows is not None:
+            self._filter_rows = [row - count if row > last else row
+                                 for row in self._filter_rows if not first <= row <= last]
+        self._reindex()
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        count = last - first + 1
+        self._proxy_to_source = [row + count if row >= first else row
+                                 for row in self._proxy_to_source]
+        if self._filter_rows is not None:
+            # New rows stay hidden until the filter is set again
+            self._filter_rows = [row + count if row >= first else row
+                                 for row in self._filter_rows]
+            self._reindex()
+            return
+
+        start = len(self._proxy_to_source)
+        self.beginInsertRows(QModelIndex(), start, start + count - 1)
+        self._proxy_to_source.extend(range(first, last + 1))
+        self._reindex()
+        self.endInsertRows()
+        if 0 <= self._sort_column < len(self.SORT_KEYS):
+            self._resort_later()
+
+    def _on_diff_about_to_be_applied(self):
+        self._in_diff = True
+
+    def _on_diff_applied(self):
+        self._in_diff = False
+        if self._resort_pending:
+            self._resort_pending = False
+            self._resort()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(self._proxy_to_source[proxy_index.row()],
+                                        proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        proxy_row = self._source_to_proxy[source_index.row()]
+        if proxy_row < 0:
+            return QModelIndex()
+        return self.index(proxy_row, source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._proxy_to_source)):
+            return QModelIndex()
+        if not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            # QObject.parent()
+            return super().parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._proxy_to_source)
+
+    def columnCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        return 0 if parent.isValid() or source is None else source.columnCount()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Vertical and role == Qt.ItemDataRole.DisplayRole:
+            return str(section + 1)
+        source = self.sourceModel()
+        return source.headerData(section, orientation, role) if source is not None else None
+
+
+def _row_ranges(rows: List[int]) -> List[tuple]:
+    """Group sorted row numbers into (first, last) runs of consecutive rows"""
+    ranges = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return [(first, last) for first, last in ranges]
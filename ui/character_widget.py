@@ -3,19 +3,26 @@ Character widget for displaying character details and items
 """
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QWidget, QVBoxLayout, QLabel,
     QScrollArea, QGridLayout, QGroupBox, QFrame
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
-from urllib.request import urlopen
-from io import BytesIO
-from PIL import Image
-import requests
+from PyQt6.QtGui import QFont
+from ui.image_loader import get_image_loader
 
 
 class ItemWidget(QFrame):
-    """Widget to display a single item"""
+    """
+    Widget to display a single item
+    
+    CharacterWidget keeps one per equipment slot and rebinds it with
+    set_item/clear_item instead of creating new widgets per character.
+    """
+    
+    ICON_SIZE = 64
+    
+    # Shared by every item name label; created with the first widget
+    _name_font = None
     
     def __init__(self, item=None):
         super().__init__()
@@ -29,8 +36,8 @@ class ItemWidget(QFrame):
         # Item image
         self.image_label = QLabel()
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setMinimumSize(64, 64)
-        self.image_label.setMaximumSize(64, 64)
+        self.image_label.setMinimumSize(self.ICON_SIZE, self.ICON_SIZE)
+        self.image_label.setMaximumSize(self.ICON_SIZE, self.ICON_SIZE)
         self.image_label.setStyleSheet("border: 1px solid #ccc; background-color: #f0f0f0;")
         
         # Item name
@@ -38,42 +45,101 @@ class ItemWidget(QFrame):
         self.name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.name_label.setWordWrap(True)
         self.name_label.setMaximumHeight(40)
-        font = self.name_label.font()
-        font.setPointSize(8)
-        self.name_label.setFont(font)
+        if ItemWidget._name_font is None:
+            ItemWidget._name_font = QFont(self.name_label.font())
+            ItemWidget._name_font.setPointSize(8)
+        self.name_label.setFont(ItemWidget._name_font)
         
         layout.addWidget(self.image_label)
         layout.addWidget(self.name_label)
         self.setLayout(layout)
         
+        # Images arrive asynchronously from the shared loader
+        self.image_url = None
+        # (name, image_url) currently shown, to skip rebinding an unchanged
+        # slot; None after a failed image so the next bind asks the loader again
+        self.shown = None
+        self.image_loader = get_image_loader()
+        self.image_loader.image_loaded.connect(self.on_image_loaded)
+        self.image_loader.image_failed.connect(self.on_image_failed)
+        
         if item:
             self.set_item(item)
             
     def set_item(self, item):
         """Set the item to display"""
+        image_url = getattr(item, 'image_url', None)
+        if self.shown == (item.name, image_url):
+            return
+        self.shown = (item.name, image_url)
         self.name_label.setText(item.name)
         
         # Load item image if available
-        if hasattr(item, 'image_url') and item.image_url:
-            try:
-                response = requests.get(item.image_url, timeout=5)
-                if response.status_code == 200:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(response.content)
-                    scaled_pixmap = pixmap.scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, 
-                                                 Qt.TransformationMode.SmoothTransformation)
-                    self.image_label.setPixmap(scaled_pixmap)
-            except:
-                # If image loading fails, show placeholder
+        self.image_url = image_url
+        if image_url:
+            pixmap = self.image_loader.request(image_url, self.ICON_SIZE, self.devicePixelRatioF())
+            if pixmap is not None:
+                self.show_image(pixmap)
+            elif self.image_loader.has_failed(image_url):
                 self.image_label.setText("No Image")
+                self.shown = None
+            else:
+                # Placeholder until the loader delivers the image
+                self.image_label.setText("...")
+        else:
+            self.image_label.clear()
+    
+    def clear_item(self):
+        """Show the slot as empty"""
+        if self.shown is None and self.image_url is None:
+            return
+        self.shown = None
+        self.image_url = None
+        self.name_label.setText("Empty")
+        self.image_label.clear()
+    
+    def show_image(self, pixmap):
+        """Show a loaded image; the loader already sized it for the icon"""
+        self.image_label.setPixmap(pixmap)
+    
+    def on_image_loaded(self, url, size, pixmap):
+        """Handle an image delivered by the loader"""
+        if url == self.image_url and size == self.ICON_SIZE:
+            self.show_image(pixmap)
+    
+    def on_image_failed(self, url):
+        """Handle an image the loader could not fetch"""
+        if url == self.image_url:
+            # If image loading fails, show placeholder
+            self.image_label.setText("No Image")
+            # Let the next set_item retry once the loader's backoff has passed
+            self.shown = None
 
 
 class CharacterWidget(QWidget):
     """Widget to display character information and equipment"""
     
+    AVATAR_SIZE = 200
+    
+    # Equipment slots and their (row, column) in the grid
+    SLOTS = [
+        ("Hat", 0, 0), ("Face", 0, 1), ("Eye", 0, 2),
+        ("Overall", 1, 0), ("Top", 1, 1), ("Bottom", 1, 2),
+        ("Shoes", 2, 0), ("Gloves", 2, 1), ("Cape", 2, 2),
+        ("Weapon", 3, 0), ("Shield", 3, 1), ("Earring", 3, 2),
+        ("Ring1", 4, 0), ("Ring2", 4, 1), ("Ring3", 4, 2), ("Ring4", 4, 3),
+        ("Pendant", 5, 0), ("Belt", 5, 1), ("Medal", 5, 2)
+    ]
+    
     def __init__(self):
         super().__init__()
         self.character = None
+        self.avatar_url = None
+        # One ItemWidget per slot, built on the first character with equipment
+        self.slot_widgets = {}
+        self.image_loader = get_image_loader()
+        self.image_loader.image_loaded.connect(self.on_avatar_loaded)
+        self.image_loader.image_failed.connect(self.on_avatar_failed)
         self.init_ui()
         
     def init_ui(self):
@@ -87,8 +153,8 @@ class CharacterWidget(QWidget):
         # Character avatar
         self.avatar_label = QLabel()
         self.avatar_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.avatar_label.setMinimumSize(200, 200)
-        self.avatar_label.setMaximumSize(200, 200)
+        self.avatar_label.setMinimumSize(self.AVATAR_SIZE, self.AVATAR_SIZE)
+        self.avatar_label.setMaximumSize(self.AVATAR_SIZE, self.AVATAR_SIZE)
         self.avatar_label.setStyleSheet("border: 2px solid #ccc; background-color: #f0f0f0;")
         
         # Character details
@@ -153,47 +219,63 @@ class CharacterWidget(QWidget):
         
         # Load character avatar if available
         if hasattr(character, 'avatar_url') and character.avatar_url:
-            try:
-                response = requests.get(character.avatar_url, timeout=5)
-                if response.status_code == 200:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(response.content)
-                    scaled_pixmap = pixmap.scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio,
-                                                 Qt.TransformationMode.SmoothTransformation)
-                    self.avatar_label.setPixmap(scaled_pixmap)
-            except:
+            self.avatar_url = character.avatar_url
+            pixmap = self.image_loader.request(character.avatar_url, self.AVATAR_SIZE,
+                                               self.devicePixelRatioF())
+            if pixmap is not None:
+                self.show_avatar(pixmap)
+            elif self.image_loader.has_failed(character.avatar_url):
                 self.avatar_label.setText("No Avatar")
+            else:
+                # Placeholder until the loader delivers the avatar
+                self.avatar_label.setText("Loading...")
         else:
+            self.avatar_url = None
             self.avatar_label.setText("No Avatar")
             
-        # Clear and update equipment
-        self.clear_equipment()
+        # Update equipment, rebinding the slot widgets in place
         if hasattr(character, 'equipment') and character.equipment:
             self.display_equipment(character.equipment)
+        else:
+            self.clear_equipment()
+            
+    def show_avatar(self, pixmap):
+        """Show a loaded avatar; the loader already sized it for the avatar box"""
+        self.avatar_label.setPixmap(pixmap)
+    
+    def on_avatar_loaded(self, url, size, pixmap):
+        """Handle an avatar delivered by the loader"""
+        if url == self.avatar_url and size == self.AVATAR_SIZE:
+            self.show_avatar(pixmap)
+    
+    def on_avatar_failed(self, url):
+        """Handle an avatar the loader could not fetch"""
+        if url == self.avatar_url:
+            self.avatar_label.setText("No Avatar")
             
     def clear_equipment(self):
         """Clear the equipment display"""
-        while self.equipment_layout.count():
-            child = self.equipment_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        # The slot widgets are kept for the next character
+        self.equipment_widget.setVisible(False)
                 
     def display_equipment(self, equipment):
         """Display character equipment"""
-        # Equipment slots mapping
-        slots = [
-            ("Hat", 0, 0), ("Face", 0, 1), ("Eye", 0, 2),
-            ("Overall", 1, 0), ("Top", 1, 1), ("Bottom", 1, 2),
-            ("Shoes", 2, 0), ("Gloves", 2, 1), ("Cape", 2, 2),
-            ("Weapon", 3, 0), ("Shield", 3, 1), ("Earring", 3, 2),
-            ("Ring1", 4, 0), ("Ring2", 4, 1), ("Ring3", 4, 2), ("Ring4", 4, 3),
-            ("Pendant", 5, 0), ("Belt", 5, 1), ("Medal", 5, 2)
-        ]
-        
-        for slot_name, row, col in slots:
-            item = equipment.get(slot_name.lower())
-            if item:
-                item_widget = ItemWidget(item)
-            else:
+        if not self.slot_widgets:
+            for slot_name, row, col in self.SLOTS:
                 item_widget = ItemWidget()
-            self.equipment_layout.addWidget(item_widget, row, col) 
\ No newline at end of file
+                self.slot_widgets[slot_name.lower()] = item_widget
+                self.equipment_layout.addWidget(item_widget, row, col)
+        
+        # Slots showing the same item as before are left alone, so only the
+        # slots that changed are repainted, all in one pass once rebound
+        self.equipment_widget.setUpdatesEnabled(False)
+        try:
+            for slot, item_widget in self.slot_widgets.items():
+                item = equipment.get(slot)
+                if item:
+                    item_widget.set_item(item)
+                else:
+                    item_widget.clear_item()
+        finally:
+            self.equipment_widget.setUpdatesEnabled(True)
+        self.equipment_widget.setVisible(True) 
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+On-demand and speculative loading of character details (equipment, avatar)
+"""
+
+import dataclasses
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from models.character import Character
+from models.ranking_diff import RankingKey, ranking_key
+
+
+def with_details(char: Character, details: Character) -> Character:
+    """Ranking row with the avatar and equipment from a detail lookup"""
+    return dataclasses.replace(char, avatar_url=details.avatar_url or char.avatar_url,
+                               equipment=details.equipment)
+
+
+class _DetailSignals(QObject):
+    """Signals used by lookup tasks to report back to the GUI thread"""
+    finished = pyqtSignal(object, object)
+
+
+class _DetailTask(QRunnable):
+    """Look up one character's details on a pool thread"""
+
+    def __init__(self, key: RankingKey, char: Character, priority: int,
+                 prefetcher: "DetailPrefetcher"):
+        super().__init__()
+        self.key = key
+        self.name = char.name
+        self.world = char.world
+        self.priority = priority
+        self.client = prefetcher.client
+        self.signals = prefetcher._signals
+
+    def run(self):
+        # get_character_details reports its own errors and returns None
+        details = self.client.get_character_details(self.name, self.world, self.priority)
+        self.signals.finished.emit(self.key, details)
+
+
+class DetailPrefetcher(QObject):
+    """
+    Loads character details for the selected row and guesses the next ones
+
+    request() fetches one character at interactive priority. prefetch()
+    replaces the queue of speculative lookups (e.g. rows next to the
+    selection or under the mouse); at most MAX_SPECULATIVE of them run at
+    once on the scheduler's background lane, and queued ones that were not
+    started yet are dropped when the queue is replaced or cancelled.
+    Loaded details are kept for DETAIL_TTL seconds, like the response cache.
+    """
+
+    details_loaded = pyqtSignal(object, object)
+
+    MAX_SPECULATIVE = 2
+    CACHE_SIZE = 500
+    DETAIL_TTL = 5 * 60
+
+    def __init__(self, parent=None, max_workers: int = 4):
+        super().__init__(parent)
+        self.client = None
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self._details: "OrderedDict[RankingKey, tuple]" = OrderedDict()
+        # Lookups started and not finished yet, with whether they are speculative
+        self._in_flight: Dict[RankingKey, bool] = {}
+        self._queue: "deque[Character]" = deque()
+        self._signals = _DetailSignals()
+        self._signals.finished.connect(self._on_finished)
+
+    def set_client(self, client):
+        self.client = client
+
+    def cached(self, char: Character) -> Optional[Character]:
+        """The row with its details if they are already loaded, otherwise None"""
+        if char.equipment:
+            # get_top_characters already filled in the top ranks
+            return char
+        entry = self._details.get(ranking_key(char))
+        if entry is None:
+            return None
+        details, loaded_at = entry
+        if time.monotonic() - loaded_at > self.DETAIL_TTL:
+            del self._details[ranking_key(char)]
+            return None
+        self._details.move_to_end(ranking_key(char))
+        return with_details(char, details)
+
+    def request(self, char: Character):
+        """Load details for char now; details_loaded follows unless they are cached"""
+        if self.client is None or self.cached(char) is not None:
+            return
+        key = ranking_key(char)
+        if key in self._in_flight:
+            # A speculative lookup is already on its way; it will do
+            self._in_flight[key] = False
+            return
+        self._start(key, char, speculative=False)
+
+    def prefetch(self, chars: Iterable[Character]):
+        """Replace the speculative queue with chars, most likely first"""
+        self._queue.clear()
+        for char in chars:
+            if self.cached(char) is None and ranking_key(char) not in self._in_flight:
+                self._queue.append(char)
+        self._pump()
+
+    def cancel_speculative(self):
+        """Drop speculative lookups that have not started"""
+        self._queue.clear()
+
+    def _start(self, key: RankingKey, char: Character, speculative: bool):
+        # Imported here: the API client module pulls in requests
+        from api.api_client import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+        self._in_flight[key] = speculative
+        priority = PRIORITY_BACKGROUND if speculative else PRIORITY_INTERACTIVE
+        # Interactive lookups go ahead of speculative ones waiting for a thread
+        self.pool.start(_DetailTask(key, char, priority, self), 0 if speculative else 1)
+
+    def _pump(self):
+        if self.client is None:
+            return
+        running = sum(1 for speculative in self._in_flight.values() if speculative)
+        while self._queue and running < self.MAX_SPECULATIVE:
+            char = self._queue.popleft()
+            key = ranking_key(char)
+            if key in self._in_flight or self.cached(char) is not None:
+                continue
+            self._start(key, char, speculative=True)
+            running += 1
+
+    def _on_finished(self, key: RankingKey, details: Optional[Character]):
+        self._in_flight.pop(key, None)
+        if details is not None:
+            self._details[key] = (details, time.monotonic())
+            self._details.move_to_end(key)
+            while len(self._details) > self.CACHE_SIZE:
+                self._details.popitem(last=False)
+        self.details_loaded.emit(key, details)
+        self._pump()
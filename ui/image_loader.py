@@ -0,0 +1,322 @@
+"""
+Asynchronous, cached image loading for character avatars and item icons
+
+Images are downloaded, decoded and resampled to their display size on a
+worker pool, so the GUI thread only turns finished QImages into pixmaps.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from PyQt6.QtCore import QBuffer, QIODevice, QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+
+from api.paths import default_cache_dir, prune_cache_dir
+
+
+class DiskImageCache:
+    """
+    Raw image bytes stored on disk, keyed by URL
+
+    The directory is pruned back under max_bytes (oldest files first) and
+    files older than max_age seconds are dropped. The first check runs on
+    the first write, which happens on a loader thread, so constructing the
+    cache at startup does not scan the directory.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024,
+                 max_age: float = 30 * 24 * 60 * 60):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        # Approximate bytes on disk; None until the first prune has counted them
+        self._used: Optional[int] = None
+        self._pruning = False
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest)
+
+    def get(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._path(url), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, url: str, data: bytes):
+        try:
+            # Write to a temp file first so readers never see a partial image
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(url))
+        except OSError as e:
+            print(f"Error writing image cache entry: {str(e)}")
+            return
+
+        with self._lock:
+            if self._used is not None:
+                self._used += len(data)
+                if self._used <= self.max_bytes:
+                    return
+            if self._pruning:
+                return
+            self._pruning = True
+        used = prune_cache_dir(self.cache_dir, self.max_bytes, self.max_age)
+        with self._lock:
+            self._used = used
+            self._pruning = False
+
+
+# (url, logical size in pixels, device pixel ratio)
+ImageKey = Tuple[str, int, float]
+
+
+def image_key(url: str, size: int, dpr: float = 1.0) -> ImageKey:
+    """Cache key for url shown in a size x size box at the given device pixel ratio"""
+    return url, size, round(dpr, 2)
+
+
+class PixmapCache:
+    """LRU of display-ready pixmaps keyed by ImageKey, evicted by decoded size in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @staticmethod
+    def cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key: Hashable) -> Optional[QPixmap]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: Hashable, pixmap: QPixmap):
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        cost = self.cost(pixmap)
+        self._entries[key] = (pixmap, cost)
+        self.total_bytes += cost
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_cost
+
+
+def _fit(width: int, height: int, box: int) -> Tuple[int, int]:
+    """Size of a width x height image scaled to fit a box x box square"""
+    scale = min(box / width, box / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def resample_image(data: bytes, box: int) -> Tuple[QImage, bytes]:
+    """
+    Decode image bytes and resample them to fit a box x box square
+
+    Returns the image and its PNG encoding for the disk cache. Pillow does
+    the work (Lanczos, with premultiplied alpha); without Pillow, Qt's smooth
+    scaling is used. Safe to call off the GUI thread.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+
+    if Image is None:
+        image = QImage.fromData(data)
+        if image.isNull():
+            raise ValueError("Could not decode image")
+        width, height = _fit(image.width(), image.height(), box)
+        image = image.scaled(width, height, Qt.AspectRatioMode.IgnoreAspectRatio,
+                             Qt.TransformationMode.SmoothTransformation)
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, "PNG")
+        return image, bytes(buffer.data())
+
+    with Image.open(io.BytesIO(data)) as source:
+        source = source.convert("RGBA")
+        resized = source.resize(_fit(source.width, source.height, box), Image.Resampling.LANCZOS)
+    encoded = io.BytesIO()
+    resized.save(encoded, "PNG", compress_level=1)
+    width, height = resized.size
+    # copy() detaches the QImage from the Python buffer it was built on
+    image = QImage(resized.tobytes(), width, height, width * 4,
+                   QImage.Format.Format_RGBA8888).copy()
+    return image, encoded.getvalue()
+
+
+class _ImageSignals(QObject):
+    """Signals used by image tasks to report back to the GUI thread"""
+    finished = pyqtSignal(object, QImage)
+    failed = pyqtSignal(object, str)
+
+
+class _ImageTask(QRunnable):
+    """
+    Produce one display-ready image on a pool thread
+
+    A resampled copy from the disk cache is used when there is one;
+    otherwise the original is read from the disk cache or the network,
+    resampled, and both are stored.
+    """
+
+    def __init__(self, key: ImageKey, loader: "ImageLoader"):
+        super().__init__()
+        self.key = key
+        self.session = loader.session
+        self.disk_cache = loader.disk_cache
+        self.timeout = loader.timeout
+        self.signals = loader._signals
+
+    def run(self):
+        url, size, dpr = self.key
+        variant = f"{url}#{size}@{dpr:g}x"
+        try:
+            image = None
+            if self.disk_cache:
+                resampled = self.disk_cache.get(variant)
+                if resampled is not None:
+                    image = QImage.fromData(resampled)
+                    if image.isNull():
+                        image = None
+
+            if image is None:
+                data = self.disk_cache.get(url) if self.disk_cache else None
+                if data is None:
+                    response = self.session.get(url, timeout=self.timeout)
+                    if response.status_code != 200:
+                        self.signals.failed.emit(self.key, f"HTTP {response.status_code}")
+                        return
+                    data = response.content
+                    if self.disk_cache:
+                        self.disk_cache.set(url, data)
+                image, encoded = resample_image(data, round(size * dpr))
+                if self.disk_cache:
+                    self.disk_cache.set(variant, encoded)
+
+            image.setDevicePixelRatio(dpr)
+            self.signals.finished.emit(self.key, image)
+        except Exception as e:
+            self.signals.failed.emit(self.key, str(e))
+
+
+class ImageLoader(QObject):
+    """
+    Loads images off the GUI thread and delivers them through signals
+
+    Images are requested at the square size they are displayed at and the
+    device pixel ratio of the widget showing them. Each (url, size, ratio)
+    is resampled at most once: display-ready pixmaps are kept in a
+    byte-bounded memory LRU, originals and resampled copies in a disk cache,
+    and requests for an image that is already loading are merged into it.
+
+    A URL that failed to load is not requested again for FAILURE_RETRY
+    seconds, doubling with each further failure up to FAILURE_RETRY_MAX, so
+    timeouts and server errors are retried later without hammering a URL
+    that keeps failing.
+    """
+    image_loaded = pyqtSignal(str, int, QPixmap)
+    image_failed = pyqtSignal(str)
+
+    FAILURE_RETRY = 30.0
+    FAILURE_RETRY_MAX = 10 * 60.0
+
+    def __init__(self, max_workers: int = 6, memory_bytes: int = 64 * 1024 * 1024,
+                 cache_dir: str = None, timeout: float = 5.0, parent=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.memory_cache = PixmapCache(memory_bytes)
+        self.disk_cache = DiskImageCache(cache_dir) if cache_dir else None
+        self._pending = set()
+        # url -> (failures in a row, time.monotonic() before which it is not retried)
+        self._failed: Dict[str, Tuple[int, float]] = {}
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self._session = None
+
+        self._signals = _ImageSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    @property
+    def session(self):
+        """HTTP session, created on the first download so startup does not load requests"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            max_workers = self.pool.maxThreadCount()
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        return self._session
+
+    def request(self, url: str, size: int, dpr: float = 1.0) -> Optional[QPixmap]:
+        """
+        Return the pixmap for url fitted to a size x size box if it is already
+        loaded, otherwise start loading it and return None; image_loaded or
+        image_failed follows later. URLs that failed recently are not retried
+        until their backoff has passed (see has_failed).
+
+        Args:
+            url: Image URL
+            size: Box the image is shown in, in device-independent pixels
+            dpr: Device pixel ratio of the widget (devicePixelRatioF())
+        """
+        key = image_key(url, size, dpr)
+        pixmap = self.memory_cache.get(key)
+        if pixmap is not None:
+            return pixmap
+        if not self.has_failed(url) and key not in self._pending:
+            self._pending.add(key)
+            self.pool.start(_ImageTask(key, self))
+        return None
+
+    def has_failed(self, url: str) -> bool:
+        """Whether url failed recently enough that it is not retried yet"""
+        failure = self._failed.get(url)
+        return failure is not None and time.monotonic() < failure[1]
+
+    def _on_finished(self, key: ImageKey, image: QImage):
+        self._pending.discard(key)
+        self._failed.pop(key[0], None)
+        # Already at its final size; this is only a conversion
+        pixmap = QPixmap.fromImage(image)
+        self.memory_cache.set(key, pixmap)
+        self.image_loaded.emit(key[0], key[1], pixmap)
+
+    def _on_failed(self, key: ImageKey, error: str):
+        self._pending.discard(key)
+        url = key[0]
+        failures = self._failed.get(url, (0, 0.0))[0] + 1
+        delay = min(self.FAILURE_RETRY * 2 ** (failures - 1), self.FAILURE_RETRY_MAX)
+        self._failed[url] = (failures, time.monotonic() + delay)
+        print(f"Error loading image {url}: {error}")
+        self.image_failed.emit(url)
+
+
+_image_loader = None
+
+
+def get_image_loader() -> ImageLoader:
+    """Shared ImageLoader for the application session"""
+    global _image_loader
+    if _image_loader is None:
+        _image_loader = ImageLoader(cache_dir=os.path.join(default_cache_dir(), "images"))
+    return _image_loader
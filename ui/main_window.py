@@ -4,16 +4,26 @@ Main window UI for Maple Story Universe API Test
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QTableWidget, QTableWidgetItem, QLabel, QPushButton,
+    QTableView, QAbstractItemView, QLabel, QPushButton,
     QLineEdit, QMessageBox, QProgressBar, QHeaderView,
-    QDialog, QDialogButtonBox, QTextEdit, QSplitter, QGroupBox
+    QDialog, QDialogButtonBox, QTextEdit, QSplitter, QGroupBox, QCheckBox,
+    QApplication, QSizePolicy
 )
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QEvent, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QPixmap
-from api.api_client import MSUApiClient
+from api.paths import default_cache_dir
 from ui.character_widget import CharacterWidget
+from ui.detail_prefetcher import DetailPrefetcher, with_details
+from ui.name_completer import NameCompleter
+from ui.character_table_model import CharacterTableModel, CharacterProxyModel, CharacterRole
+from ui.refresh_scheduler import AutoRefreshScheduler
+from models.search_index import CharacterSearchIndex
+from models.ranking_snapshot import RankingSnapshot
+from models.ranking_diff import diff_rankings, ranking_key
+from ui import startup_profile
+import inspect
 import os
-import webbrowser
+import time
 
 
 class ApiKeyDialog(QDialog):
@@ -55,7 +65,7 @@ class ApiKeyDialog(QDialog):
         
         # Open website button
         open_website_btn = QPushButton("Open MSU API Documentation")
-        open_website_btn.clicked.connect(lambda: webbrowser.open("https://msu.io/builder/docs"))
+        open_website_btn.clicked.connect(self.open_website)
         layout.addWidget(open_website_btn)
         
         # Buttons
@@ -69,6 +79,10 @@ class ApiKeyDialog(QDialog):
         
         self.setLayout(layout)
     
+    def open_website(self):
+        import webbrowser
+        webbrowser.open("https://msu.io/builder/docs")
+    
     def get_api_key(self):
         """Get the entered API key"""
         return self.api_key_input.text().strip()
@@ -78,6 +92,7 @@ class DataLoader(QThread):
     """Thread for loading data from API"""
     data_loaded = pyqtSignal(list)
     error_occurred = pyqtSignal(str)
+    rate_limited = pyqtSignal(float)
     progress_updated = pyqtSignal(int, str)
     
     def __init__(self, api_client):
@@ -86,41 +101,106 @@ class DataLoader(QThread):
         
     def run(self):
         """Run data loading in background"""
+        from api.api_client import RateLimitError
         try:
             self.progress_updated.emit(10, "Connecting to MapleStory API...")
-            characters = self.api_client.get_top_characters(limit=100)
+            if inspect.iscoroutinefunction(self.api_client.get_top_characters):
+                # Only imported for async clients; asyncio is slow to load
+                import asyncio
+                characters = asyncio.run(self.load_async())
+            else:
+                characters = self.api_client.get_top_characters(limit=100)
             self.progress_updated.emit(100, "Data loaded successfully!")
             self.data_loaded.emit(characters)
+        except RateLimitError as e:
+            self.rate_limited.emit(e.retry_after or 0.0)
         except Exception as e:
             self.error_occurred.emit(str(e))
+    
+    async def load_async(self):
+        """Load data with an async client on this thread's own event loop"""
+        try:
+            return await self.api_client.get_top_characters(limit=100)
+        finally:
+            # The pooled session belongs to this loop, so close it before the loop ends
+            await self.api_client.close()
 
 
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Delay between the last keystroke and filtering the table
+    SEARCH_DEBOUNCE_MS = 150
+    # How often the status bar's API metrics and refresh countdown update
+    STATUS_UPDATE_MS = 1000
+    # How long the mouse rests on a row before its details are prefetched
+    HOVER_PREFETCH_MS = 150
+    # Rows on each side of the selection whose details are prefetched
+    PREFETCH_NEIGHBOURS = 3
+    
     def __init__(self):
         super().__init__()
         self.api_client = None
+        self.api_worker = None
         self.characters = []
-        self.init_api_client()
+        self.current_character = None
+        self.search_index = None
+        # Last successfully loaded rankings, shown at startup before the refresh
+        self.snapshot_path = os.path.join(default_cache_dir(), "rankings.snapshot")
+        self.showing_snapshot = False
+        # The API client (and the HTTP stack it imports) is created after the
+        # window has painted, see paintEvent and start_loading
+        self.loading_started = False
         self.init_ui()
-        
+        startup_profile.mark("window constructed")
+        
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.loading_started:
+            self.loading_started = True
+            startup_profile.mark("first paint")
+            # Leave the event loop a turn to put the frame on screen first
+            QTimer.singleShot(0, self.start_loading)
+    
+    def start_loading(self):
+        """Create the API client and load the rankings once the window is up"""
+        exit_status = self.init_api_client()
+        if exit_status is not None:
+            QApplication.exit(exit_status)
+            return
+        startup_profile.mark("API client ready")
+        self.status_timer.start()
+        self.detail_prefetcher.set_client(self.api_client)
+        self.name_completer.set_client(self.api_client)
+        self.load_characters()
+    
     def init_api_client(self):
-        """Initialize API client with API key"""
+        """
+        Initialize API client with API key
+        
+        Returns None once the client is ready, otherwise the status the
+        application should exit with: 0 when the user declined to give a
+        key, 1 when the client could not be created.
+        """
+        from api.api_client import MSUApiClient
+        from api.cache import ResponseCache
+        from api.name_index import NameIndex
+        
         # Try to load API key from config
         api_key = None
         
-        # Check environment variable first
+        # Check environment variables first
         api_key = os.getenv('MSU_API_KEY')
+        base_url = os.getenv('MSU_BASE_URL')
         
         # Try to load from config.py
         if not api_key:
             try:
                 import config
                 api_key = getattr(config, 'MSU_API_KEY', None)
-                base_url = getattr(config, 'MSU_BASE_URL', None)
+                base_url = base_url or getattr(config, 'MSU_BASE_URL', None)
             except ImportError:
-                base_url = None
+                pass
         
         # If no API key, show dialog
         if not api_key or api_key == "your_msu_api_key_here":
@@ -133,17 +213,21 @@ class MainWindow(QMainWindow):
                 else:
                     QMessageBox.warning(self, "No API Key", 
                                       "No API key provided. The application will exit.")
-                    exit(0)
+                    return 0
             else:
                 QMessageBox.information(self, "No API Key", 
                                       "API key is required. The application will exit.")
-                exit(0)
+                return 0
         
         try:
-            self.api_client = MSUApiClient(api_key=api_key, base_url=base_url)
+            cache = ResponseCache(cache_dir=os.path.join(default_cache_dir(), "responses"))
+            name_index = NameIndex(os.path.join(default_cache_dir(), "names.txt"))
+            self.api_client = MSUApiClient(api_key=api_key, base_url=base_url, cache=cache,
+                                           name_index=name_index)
         except ValueError as e:
             QMessageBox.critical(self, "API Error", str(e))
-            exit(1)
+            return 1
+        return None
     
     def save_api_key(self, api_key):
         """Save API key to config.py"""
@@ -185,11 +269,39 @@ class MainWindow(QMainWindow):
         self.refresh_btn.clicked.connect(self.load_characters)
         toolbar_layout.addWidget(self.refresh_btn)
         
+        self.rank_changes_check = QCheckBox("Rank changes")
+        self.rank_changes_check.setToolTip("Show how ranks moved since the previous refresh")
+        self.rank_changes_check.toggled.connect(
+            lambda checked: self.table_model.set_show_rank_changes(checked))
+        toolbar_layout.addWidget(self.rank_changes_check)
+        
+        # Background refreshes that slow down when nothing changes
+        self.refresh_scheduler = AutoRefreshScheduler(self)
+        self.refresh_scheduler.refresh_requested.connect(self.load_characters)
+        
+        self.auto_refresh_check = QCheckBox("Auto refresh")
+        self.auto_refresh_check.setToolTip(
+            "Refresh periodically; the interval adapts to how often the rankings change")
+        self.auto_refresh_check.toggled.connect(self.on_auto_refresh_toggled)
+        toolbar_layout.addWidget(self.auto_refresh_check)
+        
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search character...")
-        self.search_input.textChanged.connect(self.filter_characters)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
         toolbar_layout.addWidget(self.search_input)
         
+        # Suggests names of every character seen so far, not just the table's
+        self.name_completer = NameCompleter(self.search_input, self)
+        self.name_completer.completer.activated.connect(self.on_name_completed)
+        self.name_completer.character_found.connect(self.on_character_found)
+        
+        # Wait for a pause in typing before filtering
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(
+            lambda: self.filter_characters(self.search_input.text()))
+        
         toolbar_layout.addStretch()
         main_layout.addLayout(toolbar_layout)
         
@@ -200,9 +312,21 @@ class MainWindow(QMainWindow):
         left_panel = QGroupBox("Top 100 Characters")
         left_layout = QVBoxLayout()
         
-        self.character_table = QTableWidget()
-        self.character_table.setColumnCount(4)
-        self.character_table.setHorizontalHeaderLabels(["Rank", "Name", "Level", "Job"])
+        # The view only asks the model for the rows on screen, and the proxy
+        # sorts/filters by row numbers, so large rankings stay responsive
+        self.table_model = CharacterTableModel(self)
+        self.proxy_model = CharacterProxyModel(self)
+        self.proxy_model.setSourceModel(self.table_model)
+        
+        self.character_table = QTableView()
+        self.character_table.setModel(self.proxy_model)
+        self.character_table.setSortingEnabled(True)
+        self.character_table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        
+        # Uniform row heights let the view skip measuring every row
+        vertical_header = self.character_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(vertical_header.minimumSectionSize() + 6)
         
         # Set column resize modes for better display
         header = self.character_table.horizontalHeader()
@@ -210,6 +334,8 @@ class MainWindow(QMainWindow):
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)           # Name - stretches
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)  # Level
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)           # Job - stretches
+        # Size columns from the rows on screen rather than sampling the whole table
+        header.setResizeContentsPrecision(0)
         
         # Set minimum column widths
         self.character_table.setColumnWidth(0, 50)   # Rank
@@ -221,8 +347,22 @@ class MainWindow(QMainWindow):
         self.character_table.setWordWrap(False)
         self.character_table.setTextElideMode(Qt.TextElideMode.ElideNone)
         
-        self.character_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.character_table.itemSelectionChanged.connect(self.on_character_selected)
+        self.character_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.character_table.selectionModel().selectionChanged.connect(self.on_character_selected)
+        
+        # Details are loaded for the selected row on demand and guessed for
+        # the rows next to it and under the mouse
+        self.detail_prefetcher = DetailPrefetcher(self)
+        self.detail_prefetcher.details_loaded.connect(self.on_details_loaded)
+        self.hovered_row = None
+        self.character_table.setMouseTracking(True)
+        self.character_table.entered.connect(self.on_row_hovered)
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(self.HOVER_PREFETCH_MS)
+        self.hover_timer.timeout.connect(self.update_prefetch)
+        # Scrolling away makes the queued guesses useless; re-aim once it settles
+        self.character_table.verticalScrollBar().valueChanged.connect(self.on_table_scrolled)
         
         left_layout.addWidget(self.character_table)
         left_panel.setLayout(left_layout)
@@ -240,80 +380,274 @@ class MainWindow(QMainWindow):
         
         main_layout.addWidget(splitter)
         
-        # Status bar
-        self.status_label = QLabel("Ready")
+        # Status bar: the last message, the next auto refresh and live API metrics
+        self.status_message = "Ready"
+        self.status_label = QLabel(self.status_message)
+        # Long metrics lines are clipped rather than widening the window
+        self.status_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
         main_layout.addWidget(self.status_label)
         
-        # Load initial data
-        self.load_characters()
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(self.STATUS_UPDATE_MS)
+        self.status_timer.timeout.connect(self.update_status_label)
+        
+        # Show the saved rankings on the first frame; the refresh starts after it
+        self.load_snapshot()
+    
+    def load_snapshot(self):
+        """Fill the table from the rankings saved by the last successful load"""
+        if not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with RankingSnapshot.load(self.snapshot_path) as snapshot:
+                characters = snapshot.to_characters()
+                saved_at = snapshot.saved_at
+        except (OSError, ValueError) as e:
+            print(f"Error reading saved rankings: {str(e)}")
+            return
+        
+        self.characters = characters
+        self.showing_snapshot = True
+        self.update_character_table(characters)
+        saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(saved_at)) if saved_at else "earlier"
+        self.set_status(f"Showing {len(characters)} characters saved {saved}")
+    
+    def save_snapshot(self, characters):
+        """Persist loaded rankings for the next startup"""
+        try:
+            RankingSnapshot.from_characters(characters).save(self.snapshot_path)
+        except OSError as e:
+            print(f"Error saving rankings: {str(e)}")
         
     def load_characters(self):
         """Load character data from API"""
+        if self.api_client is None:
+            # Still starting up; start_loading will load them
+            return
+        if self.api_worker is not None and self.api_worker.isRunning():
+            # The refresh already in progress will bring the same data
+            return
+        self.refresh_scheduler.refresh_started()
         self.refresh_btn.setEnabled(False)
-        self.status_label.setText("Loading characters...")
+        if self.showing_snapshot:
+            self.set_status(f"{self.status_message} - refreshing...")
+        else:
+            self.set_status("Loading characters...")
         
         # Create and start worker thread
         self.api_worker = DataLoader(self.api_client)
         self.api_worker.data_loaded.connect(self.on_data_loaded)
         self.api_worker.error_occurred.connect(self.on_error)
+        self.api_worker.rate_limited.connect(self.on_rate_limited)
         self.api_worker.progress_updated.connect(self.on_progress_update)
         self.api_worker.start()
         
     def on_data_loaded(self, characters):
         """Handle loaded character data"""
-        self.characters = characters
-        self.update_character_table(characters)
+        startup_profile.mark("rankings loaded")
         self.refresh_btn.setEnabled(True)
-        self.status_label.setText(f"Loaded {len(characters)} characters")
+        using_mock_data = getattr(self.api_client, 'using_mock_data', False)
+        if using_mock_data:
+            # The API call failed, so the refresh backs off like any other
+            # error; the mock rows say nothing about how the rankings moved
+            self.refresh_scheduler.report_error()
+            if self.showing_snapshot:
+                # Saved real data beats mock data
+                self.set_status("Could not refresh; showing saved characters")
+                return
+        else:
+            self.save_snapshot(characters)
+        
+        self.showing_snapshot = False
+        diff = self.refresh_character_table(characters)
+        changed_rows = None
+        if diff is not None:
+            changed_rows = len(diff.inserted) + len(diff.removed) + len(diff.replacements())
+        if not using_mock_data:
+            self.refresh_scheduler.report_result(changed_rows, len(characters))
+        if diff is None:
+            self.set_status(f"Loaded {len(characters)} characters")
+        else:
+            self.set_status(f"Loaded {len(characters)} characters ({diff.summary()})")
         
     def on_error(self, error_msg):
         """Handle API errors"""
         self.refresh_btn.setEnabled(True)
-        self.status_label.setText(f"Error: {error_msg}")
+        self.refresh_scheduler.report_error()
+        self.set_status(f"Error: {error_msg}")
+    
+    def on_rate_limited(self, retry_after):
+        """Back off while the API is throttling us"""
+        self.refresh_btn.setEnabled(True)
+        self.refresh_scheduler.report_throttled(retry_after)
+        self.set_status("Rate limited by the MSU API")
+    
+    def set_status(self, message):
+        """Show a status message, with the next automatic refresh if one is planned"""
+        self.status_message = message
+        self.update_status_label()
+    
+    def update_status_label(self):
+        """Render the status message, refresh countdown and API metrics summary"""
+        text = self.status_message
+        seconds = self.refresh_scheduler.seconds_until_next()
+        if seconds is not None:
+            text = f"{text} - next refresh in {round(seconds)}s"
+        if self.api_client is not None:
+            text = f"{text} | API: {self.api_client.metrics.summary()}"
+            self.status_label.setToolTip("\n".join(self.api_client.metrics.endpoint_summaries()))
+        if text != self.status_label.text():
+            self.status_label.setText(text)
+    
+    def on_auto_refresh_toggled(self, checked):
+        if checked:
+            self.refresh_scheduler.start()
+        else:
+            self.refresh_scheduler.stop()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_scheduler.set_paused(self.isMinimized())
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Nobody is looking; don't spend requests on it
+        self.refresh_scheduler.set_paused(True)
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.refresh_scheduler.set_paused(self.isMinimized() or not self.isVisible())
     
     def on_progress_update(self, progress, message):
         """Handle progress updates"""
-        self.status_label.setText(message)
+        self.set_status(message)
         
     def update_character_table(self, characters):
         """Update the character table with data"""
-        self.character_table.setRowCount(len(characters))
+        self.table_model.set_characters(characters)
+        # Built on the first search against this data
+        self.search_index = None
         
-        for i, char in enumerate(characters):
-            # Rank column
-            rank_item = QTableWidgetItem(str(char.rank))
-            self.character_table.setItem(i, 0, rank_item)
-            
-            # Name column - with tooltip for full name
-            name_item = QTableWidgetItem(char.name)
-            name_item.setToolTip(char.name)  # Show full name on hover
-            self.character_table.setItem(i, 1, name_item)
-            
-            # Level column
-            level_item = QTableWidgetItem(str(char.level))
-            self.character_table.setItem(i, 2, level_item)
-            
-            # Job column
-            job_item = QTableWidgetItem(char.job)
-            job_item.setToolTip(char.job)  # Show full job name on hover
-            self.character_table.setItem(i, 3, job_item)
+        # Keep the current search applied to the new data
+        if self.search_input.text():
+            self.filter_characters(self.search_input.text())
             
+    def refresh_character_table(self, characters):
+        """
+        Apply a refreshed ranking to the table as row-level changes
+        
+        Only rows that moved, changed, appeared or disappeared are touched, so
+        the selection and scroll position survive the refresh. Returns the
+        RankingDiff that was applied, or None when the table was filled from
+        scratch.
+        """
+        if not self.table_model.characters:
+            self.characters = characters
+            self.update_character_table(characters)
+            return None
+        
+        diff = diff_rankings(self.table_model.characters, characters)
+        if not diff.is_empty:
+            self.table_model.apply_diff(diff)
+            # Row numbers in the index no longer match the table
+            self.search_index = None
+            if self.search_input.text():
+                self.filter_characters(self.search_input.text())
+        self.characters = self.table_model.characters
+        
+        # Show the refreshed data if the selected character was updated
+        selected_rows = self.character_table.selectionModel().selectedRows()
+        if selected_rows and selected_rows[0].data(CharacterRole) is not self.current_character:
+            self.on_character_selected()
+        return diff
+    
     def on_character_selected(self):
         """Handle character selection"""
-        selected_rows = self.character_table.selectedIndexes()
+        selected_rows = self.character_table.selectionModel().selectedRows()
         if selected_rows:
-            row = selected_rows[0].row()
-            if row < len(self.characters):
-                self.current_character = self.characters[row]
-                self.character_widget.set_character(self.current_character)
+            character = selected_rows[0].data(CharacterRole)
+            if character is not None:
+                self.current_character = character
+                detailed = self.detail_prefetcher.cached(character)
+                self.character_widget.set_character(detailed or character)
+                if detailed is None:
+                    self.detail_prefetcher.request(character)
+                self.update_prefetch()
+    
+    def on_details_loaded(self, key, details):
+        """Show details that arrived for the selected character"""
+        if (details is not None and self.current_character is not None
+                and ranking_key(self.current_character) == key):
+            self.character_widget.set_character(with_details(self.current_character, details))
+    
+    def on_row_hovered(self, index):
+        self.hovered_row = index.row()
+        self.hover_timer.start()
+    
+    def on_table_scrolled(self):
+        self.hovered_row = None
+        self.detail_prefetcher.cancel_speculative()
+        self.hover_timer.start()
+    
+    def update_prefetch(self):
+        """Queue details for the hovered row and the visible rows around the selection"""
+        view = self.character_table
+        first = view.rowAt(0)
+        if first < 0:
+            return
+        last = view.rowAt(view.viewport().height() - 1)
+        if last < 0:
+            last = self.proxy_model.rowCount() - 1
+        
+        rows = []
+        if self.hovered_row is not None:
+            rows.append(self.hovered_row)
+        selected = view.selectionModel().selectedRows()
+        if selected:
+            row = selected[0].row()
+            for offset in range(1, self.PREFETCH_NEIGHBOURS + 1):
+                # Rows below first: clicking down the leaderboard is the common case
+                rows.extend((row + offset, row - offset))
+        
+        characters = []
+        for row in rows:
+            if first <= row <= last:
+                character = self.proxy_model.index(row, 0).data(CharacterRole)
+                if character is not None:
+                    characters.append(character)
+        self.detail_prefetcher.prefetch(characters)
                 
+    def on_search_text_changed(self, text):
+        """Restart the search debounce; clearing the box filters at once"""
+        self.name_completer.update(text)
+        if text:
+            self.search_timer.start()
+        else:
+            self.search_timer.stop()
+            self.filter_characters(text)
+    
     def filter_characters(self, text):
         """Filter characters based on search text"""
         if not text:
-            self.update_character_table(self.characters)
+            self.proxy_model.set_filter_rows(None)
             return
-            
-        filtered = [char for char in self.characters 
-                   if text.lower() in char.name.lower() 
-                   or text.lower() in char.job.lower()]
-        self.update_character_table(filtered) 
\ No newline at end of file
+        
+        if self.search_index is None:
+            self.search_index = CharacterSearchIndex(self.table_model.characters)
+        self.proxy_model.set_filter_rows(self.search_index.search(text))
+    
+    def on_name_completed(self, name):
+        """Filter to the chosen name, looking it up if it is not in the table"""
+        self.search_timer.stop()
+        self.filter_characters(name)
+        if self.proxy_model.rowCount() == 0:
+            self.set_status(f"Looking up {name}...")
+            self.name_completer.look_up(name)
+    
+    def on_character_found(self, character):
+        """Show a character looked up from the search box"""
+        if self.search_input.text() == character.name:
+            self.current_character = character
+            self.character_widget.set_character(character)
+            self.set_status(f"Showing {character.name}") 
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Character name completion for the search box
+"""
+
+from typing import List
+
+from PyQt6.QtCore import QObject, QRunnable, QStringListModel, Qt, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QCompleter, QLineEdit
+
+
+class _CompletionSignals(QObject):
+    """Signals used by completion tasks to report back to the GUI thread"""
+    completed = pyqtSignal(str, list)
+    found = pyqtSignal(object)
+
+
+class _AutocompleteTask(QRunnable):
+    """Ask the API for names the local index could not complete"""
+
+    def __init__(self, prefix: str, completer: "NameCompleter"):
+        super().__init__()
+        self.prefix = prefix
+        self.client = completer.client
+        self.limit = completer.MAX_SUGGESTIONS
+        self.signals = completer._signals
+
+    def run(self):
+        # autocomplete reports its own errors and returns the local matches
+        names = self.client.autocomplete(self.prefix, limit=self.limit)
+        self.signals.completed.emit(self.prefix, names)
+
+
+class _LookupTask(QRunnable):
+    """Look up a completed name that is not in the loaded rankings"""
+
+    def __init__(self, name: str, completer: "NameCompleter"):
+        super().__init__()
+        self.name = name
+        self.client = completer.client
+        self.signals = completer._signals
+
+    def run(self):
+        character = self.client.get_character_details(self.name)
+        if character is not None:
+            self.signals.found.emit(character)
+
+
+class NameCompleter(QObject):
+    """
+    Suggests character names as the user types in a search box
+
+    Suggestions come from the API client's name index on every keystroke.
+    When the index cannot complete the text on its own, the search endpoint
+    is asked once typing pauses for API_DEBOUNCE_MS, and the suggestions are
+    refreshed if the text has not changed by the time it answers.
+    """
+
+    character_found = pyqtSignal(object)
+
+    MAX_SUGGESTIONS = 10
+    API_DEBOUNCE_MS = 300
+
+    def __init__(self, line_edit: QLineEdit, parent=None):
+        super().__init__(parent)
+        self.client = None
+        self.line_edit = line_edit
+        self.model = QStringListModel(self)
+        self.completer = QCompleter(self.model, self)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        # The index already did the matching
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        line_edit.setCompleter(self.completer)
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.api_timer = QTimer(self)
+        self.api_timer.setSingleShot(True)
+        self.api_timer.setInterval(self.API_DEBOUNCE_MS)
+        self.api_timer.timeout.connect(self._ask_api)
+        self._signals = _CompletionSignals()
+        self._signals.completed.connect(self._on_completed)
+        self._signals.found.connect(self.character_found)
+
+    def set_client(self, client):
+        self.client = client
+
+    def update(self, text: str):
+        """Show suggestions for text from the local index"""
+        self.api_timer.stop()
+        if self.client is None or not text.strip():
+            self._show([])
+            return
+        index = self.client.name_index
+        if index is None:
+            # Nothing to answer from locally; every suggestion comes from the API
+            self.api_timer.start()
+            return
+        names = index.complete(text, limit=self.MAX_SUGGESTIONS)
+        self._show(names)
+        if len(names) < self.MAX_SUGGESTIONS and not index.is_exhausted(text):
+            self.api_timer.start()
+
+    def look_up(self, name: str):
+        """Fetch a character by name; character_found follows if it exists"""
+        if self.client is not None:
+            self.pool.start(_LookupTask(name, self))
+
+    def _ask_api(self):
+        if self.client is not None:
+            self.pool.start(_AutocompleteTask(self.line_edit.text(), self))
+
+    def _on_completed(self, prefix: str, names: List[str]):
+        if prefix == self.line_edit.text():
+            self._show(names)
+
+    def _show(self, names: List[str]):
+        self.model.setStringList(names)
+        text = self.line_edit.text()
+        popup = self.completer.popup()
+        if not names or names == [text] or not self.line_edit.hasFocus():
+            popup.hide()
+        else:
+            self.completer.setCompletionPrefix(text)
+            self.completer.complete()
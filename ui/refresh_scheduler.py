@@ -0,0 +1,129 @@
+"""
+Adaptive timer for background ranking refreshes
+"""
+
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class AutoRefreshScheduler(QObject):
+    """
+    Decides when the next automatic refresh should run
+
+    The interval adapts to what the last refresh found: it grows when the
+    rankings did not change, the API is throttling or the request failed,
+    and shrinks when many rows moved. While paused (e.g. the window is
+    hidden) the countdown is frozen and resumes where it stopped.
+
+    Each refresh adjusts the interval once: only the first report after
+    refresh_started counts.
+
+    Args:
+        base_interval: Starting interval in seconds
+        min_interval: Shortest interval in seconds; the response cache keeps
+            rankings for 60 s, so refreshing faster would only hit the cache
+        max_interval: Longest interval in seconds
+    """
+
+    refresh_requested = pyqtSignal()
+
+    # Share of rows that must change for the rankings to count as volatile
+    VOLATILE_FRACTION = 0.1
+    BACKOFF_FACTOR = 1.5
+    SPEEDUP_FACTOR = 0.5
+
+    def __init__(self, parent=None, base_interval: float = 120.0,
+                 min_interval: float = 60.0, max_interval: float = 15 * 60.0):
+        super().__init__(parent)
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = base_interval
+        self.enabled = False
+        self.paused = False
+        self.in_flight = False
+        self._remaining_ms = int(base_interval * 1000)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self):
+        """Enable automatic refreshes, starting from the base interval"""
+        self.enabled = True
+        self.interval = self.base_interval
+        self._schedule()
+
+    def stop(self):
+        self.enabled = False
+        self._timer.stop()
+
+    def set_paused(self, paused: bool):
+        """Freeze the countdown while paused and continue it on resume"""
+        if paused == self.paused:
+            return
+        self.paused = paused
+        if paused:
+            if self._timer.isActive():
+                self._remaining_ms = max(0, self._timer.remainingTime())
+                self._timer.stop()
+        elif self.enabled and not self.in_flight:
+            self._timer.start(self._remaining_ms)
+
+    def refresh_started(self):
+        """Note that a refresh (automatic or manual) is running"""
+        self.in_flight = True
+        self._timer.stop()
+
+    def report_result(self, changed_rows: Optional[int], total_rows: int):
+        """
+        Adapt the interval to how much the last refresh changed
+
+        changed_rows is None when there was nothing to compare against
+        (e.g. the first load); the interval is then left as it is.
+        """
+        if not self.in_flight:
+            return
+        if changed_rows is None:
+            pass
+        elif changed_rows == 0:
+            self.interval *= self.BACKOFF_FACTOR
+        elif total_rows and changed_rows / total_rows >= self.VOLATILE_FRACTION:
+            self.interval *= self.SPEEDUP_FACTOR
+        else:
+            # Some movement: drift back towards the base interval
+            self.interval = (self.interval + self.base_interval) / 2
+        self._finished()
+
+    def report_throttled(self, retry_after: Optional[float] = None):
+        """Back off after the API answered 429"""
+        if not self.in_flight:
+            return
+        self.interval = max(self.interval * 2, retry_after or 0)
+        self._finished()
+
+    def report_error(self):
+        """Back off after a failed refresh"""
+        if not self.in_flight:
+            return
+        self.interval *= self.BACKOFF_FACTOR
+        self._finished()
+
+    def seconds_until_next(self) -> Optional[float]:
+        if not self._timer.isActive():
+            return None
+        return self._timer.remainingTime() / 1000
+
+    def _finished(self):
+        self.in_flight = False
+        self.interval = min(self.max_interval, max(self.min_interval, self.interval))
+        self._schedule()
+
+    def _schedule(self):
+        self._remaining_ms = int(self.interval * 1000)
+        if self.enabled and not self.paused and not self.in_flight:
+            self._timer.start(self._remaining_ms)
+
+    def _on_timeout(self):
+        if self.enabled and not self.paused and not self.in_flight:
+            self.refresh_requested.emit()
@@ -0,0 +1,30 @@
+"""
+Startup phase timings
+
+Set MSU_STARTUP_PROFILE=1 to print how long each startup phase took to
+stderr. For a per-module breakdown of the import phase, run
+`python -X importtime main.py` as well.
+"""
+
+import os
+import sys
+import time
+
+
+ENABLED = os.getenv("MSU_STARTUP_PROFILE", "") not in ("", "0")
+
+_start = time.perf_counter()
+_last = _start
+_marked = set()
+
+
+def mark(phase: str):
+    """Report that a startup phase finished; later marks of the same phase are ignored"""
+    global _last
+    if not ENABLED or phase in _marked:
+        return
+    _marked.add(phase)
+    now = time.perf_counter()
+    print(f"[startup] {(now - _start) * 1000:8.1f} ms  (+{(now - _last) * 1000:7.1f} ms)  {phase}",
+          file=sys.stderr)
+    _last = now